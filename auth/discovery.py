@@ -0,0 +1,72 @@
+"""
+Google API service construction.
+
+build() re-reads and re-parses the bundled discovery document on every call,
+which costs about a millisecond per tool invocation for the larger APIs. The
+document text is kept in memory here and parsed with orjson when available;
+each call still gets its own parsed copy because googleapiclient annotates the
+document in place while creating methods.
+
+Each service also used to get a fresh httplib2.Http, so every tool call paid
+for a new TLS handshake. Services built here draw their connection pool from
+a small set of idle transports, which release_service() returns them to.
+"""
+
+import json
+from collections import deque
+from functools import lru_cache
+from typing import Optional
+
+import google_auth_httplib2
+import httplib2
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.http import build_http
+
+from auth.json_model import API_JSON_MODEL, orjson
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+# Idle transports hold open connections only; credentials are attached per
+# service, so a transport can be reused across users
+MAX_IDLE_TRANSPORTS = 16
+_idle_transports: deque = deque()
+
+
+@lru_cache(maxsize=None)
+def _static_discovery_doc(service_name: str, version: str) -> Optional[str]:
+    return discovery_cache.get_static_doc(service_name, version)
+
+
+def _checkout_transport() -> httplib2.Http:
+    try:
+        return _idle_transports.pop()
+    except IndexError:
+        return build_http()
+
+
+def build_service(service_name: str, version: str, credentials):
+    """Build a Google API client using the bundled discovery document."""
+    http = google_auth_httplib2.AuthorizedHttp(
+        credentials, http=_checkout_transport()
+    )
+    document = _static_discovery_doc(service_name, version)
+    if document is None:
+        # Not bundled with googleapiclient; let build() fetch it
+        return build(service_name, version, http=http, model=API_JSON_MODEL)
+    return build_from_document(_loads(document), http=http, model=API_JSON_MODEL)
+
+
+def release_service(service) -> None:
+    """
+    Release a service built by build_service() once nothing can still be
+    using it, keeping its connections open for the next service.
+    """
+    transport = getattr(getattr(service, "_http", None), "http", None)
+    if (
+        isinstance(transport, httplib2.Http)
+        and len(_idle_transports) < MAX_IDLE_TRANSPORTS
+    ):
+        _idle_transports.append(transport)
+    else:
+        service.close()
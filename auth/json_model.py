@@ -0,0 +1,38 @@
+"""
+JSON model for Google API clients.
+
+googleapiclient decodes every response body with the stdlib json module.
+When orjson is installed, responses are decoded with it instead, which is
+noticeably faster for large payloads such as permission lists or sheet values.
+"""
+
+import json
+
+from googleapiclient.model import JsonModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJsonModel(JsonModel):
+    """JsonModel that decodes response bodies with orjson when available."""
+
+    def deserialize(self, content):
+        if orjson is None:
+            return super().deserialize(content)
+        try:
+            body = orjson.loads(content)
+        except json.JSONDecodeError:
+            # Mirror JsonModel: undecodable bodies are returned as text
+            if isinstance(content, bytes):
+                content = content.decode("utf-8")
+            return content
+        if self._data_wrapper and isinstance(body, dict) and "data" in body:
+            body = body["data"]
+        return body
+
+
+# None of the Workspace APIs used here declare the dataWrapper feature
+API_JSON_MODEL = FastJsonModel(data_wrapper=False)
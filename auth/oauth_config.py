@@ -366,12 +366,17 @@ def get_oauth_config() -> OAuthConfig:
     """
     Get the global OAuth configuration instance.
 
-    Thread-safe singleton accessor.
+    Thread-safe singleton accessor. Once initialized, the instance is returned
+    without taking the lock so per-call lookups such as is_stateless_mode() and
+    get_transport_mode() stay a plain attribute read.
 
     Returns:
         The singleton OAuth configuration instance
     """
     global _oauth_config
+    config = _oauth_config
+    if config is not None:
+        return config
     with _oauth_config_lock:
         if _oauth_config is None:
             _oauth_config = OAuthConfig()
@@ -7,9 +7,9 @@ from typing import Dict, List, Optional, Any, Callable, Union, Tuple
 from contextlib import ExitStack
 
 from google.auth.exceptions import RefreshError
-from googleapiclient.discovery import build
 from fastmcp.server.dependencies import get_access_token, get_context
 from auth.google_auth import get_authenticated_google_service, GoogleAuthenticationError
+from auth.discovery import build_service, release_service
 from auth.oauth21_session_store import (
     get_auth_provider,
     get_oauth21_session_store,
@@ -281,7 +281,7 @@ async def get_authenticated_google_service_oauth21(
                 f"OAuth credentials lack required scopes. Need: {required_scopes}, Have: {sorted(scopes_available)}"
             )
 
-        service = build(service_name, version, credentials=credentials)
+        service = build_service(service_name, version, credentials)
         logger.info(f"[{tool_name}] Authenticated {service_name} for {resolved_email}")
         return service, resolved_email
 
@@ -311,7 +311,7 @@ async def get_authenticated_google_service_oauth21(
             f"OAuth 2.1 credentials lack required scopes. Need: {required_scopes}, Have: {sorted(scopes_available)}"
         )
 
-    service = build(service_name, version, credentials=credentials)
+    service = build_service(service_name, version, credentials)
     logger.info(f"[{tool_name}] Authenticated {service_name} for {user_google_email}")
 
     return service, user_google_email
@@ -685,15 +685,21 @@ def require_google_service(
                     kwargs["user_google_email"] = user_google_email
 
                 # Prepend the fetched service object to the original arguments
-                return await func(service, *args, **kwargs)
+                result = await func(service, *args, **kwargs)
             except RefreshError as e:
+                service.close()
                 error_message = _handle_token_refresh_error(
                     e, actual_user_email, service_name
                 )
                 raise GoogleAuthenticationError(error_message)
-            finally:
-                if service:
-                    service.close()
+            except BaseException:
+                # A cancelled or failed tool may leave requests running in
+                # worker threads, so its connections are not reused
+                service.close()
+                raise
+
+            release_service(service)
+            return result
 
         # Set the wrapper's signature to the one without 'service'
         wrapper.__signature__ = wrapper_sig
@@ -47,9 +47,11 @@ class AttachmentStorage:
 
     def save_attachment(
         self,
-        base64_data: str,
+        base64_data: Optional[str] = None,
         filename: Optional[str] = None,
         mime_type: Optional[str] = None,
+        *,
+        file_bytes: Optional[bytes] = None,
     ) -> SavedAttachment:
         """
         Save an attachment to local disk.
@@ -58,21 +60,27 @@ class AttachmentStorage:
             base64_data: Base64-encoded attachment data
             filename: Original filename (optional)
             mime_type: MIME type (optional)
+            file_bytes: Raw attachment bytes; use instead of base64_data when the
+                content is already decoded to avoid an encode/decode round trip
 
         Returns:
             SavedAttachment with file_id (UUID) and path (absolute file path)
         """
+        if file_bytes is None and base64_data is None:
+            raise ValueError("Either base64_data or file_bytes must be provided")
+
         _ensure_storage_dir()
 
         # Generate unique file ID for metadata tracking
         file_id = str(uuid.uuid4())
 
         # Decode base64 data
-        try:
-            file_bytes = base64.urlsafe_b64decode(base64_data)
-        except Exception as e:
-            logger.error(f"Failed to decode base64 attachment data: {e}")
-            raise ValueError(f"Invalid base64 data: {e}")
+        if file_bytes is None:
+            try:
+                file_bytes = base64.urlsafe_b64decode(base64_data)
+            except Exception as e:
+                logger.error(f"Failed to decode base64 attachment data: {e}")
+                raise ValueError(f"Invalid base64 data: {e}")
 
         # Determine file extension from filename or mime type
         extension = ""
@@ -106,8 +114,10 @@ class AttachmentStorage:
             try:
                 total_written = 0
                 data_len = len(file_bytes)
+                # memoryview slices avoid copying the remainder on partial writes
+                data_view = memoryview(file_bytes)
                 while total_written < data_len:
-                    written = os.write(fd, file_bytes[total_written:])
+                    written = os.write(fd, data_view[total_written:])
                     if written == 0:
                         raise OSError(
                             "os.write returned 0 bytes; could not write attachment data"
@@ -6,12 +6,21 @@ Shared utilities for Google Drive operations including permission checking.
 
 import asyncio
 import re
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional, Tuple
 
 VALID_SHARE_ROLES = {"reader", "commenter", "writer"}
 VALID_SHARE_TYPES = {"user", "group", "domain", "anyone"}
 
 
+def is_public_link_permission(permission: Dict[str, Any]) -> bool:
+    """Return True if a single permission grants 'anyone with the link' access."""
+    return (
+        permission.get("type") == "anyone"
+        and permission.get("role") in VALID_SHARE_ROLES
+    )
+
+
 def check_public_link_permission(permissions: List[Dict[str, Any]]) -> bool:
     """
     Check if file has 'anyone with the link' permission.
@@ -22,10 +31,7 @@ def check_public_link_permission(permissions: List[Dict[str, Any]]) -> bool:
     Returns:
         bool: True if file has public link sharing enabled
     """
-    return any(
-        p.get("type") == "anyone" and p.get("role") in ["reader", "writer", "commenter"]
-        for p in permissions
-    )
+    return any(is_public_link_permission(p) for p in permissions)
 
 
 def format_public_sharing_error(file_name: str, file_id: str) -> str:
@@ -113,6 +119,19 @@ def validate_expiration_time(expiration_time: str) -> None:
         )
 
 
+# Grantee label per permission type; unknown types fall back to the raw type name
+_PERMISSION_GRANTEE_FORMATTERS = {
+    "anyone": lambda p: "Anyone with the link",
+    "user": lambda p: f"User: {p.get('emailAddress', 'unknown')}",
+    "group": lambda p: f"Group: {p.get('emailAddress', 'unknown')}",
+    "domain": lambda p: f"Domain: {p.get('domain', 'unknown')}",
+}
+
+
+def _format_unknown_grantee(permission: Dict[str, Any]) -> str:
+    return permission.get("type", "unknown")
+
+
 def format_permission_info(permission: Dict[str, Any]) -> str:
     """
     Format a permission object for display.
@@ -123,23 +142,10 @@ def format_permission_info(permission: Dict[str, Any]) -> str:
     Returns:
         str: Human-readable permission description with ID
     """
-    perm_type = permission.get("type", "unknown")
-    role = permission.get("role", "unknown")
-    perm_id = permission.get("id", "")
-
-    if perm_type == "anyone":
-        base = f"Anyone with the link ({role}) [id: {perm_id}]"
-    elif perm_type == "user":
-        email = permission.get("emailAddress", "unknown")
-        base = f"User: {email} ({role}) [id: {perm_id}]"
-    elif perm_type == "group":
-        email = permission.get("emailAddress", "unknown")
-        base = f"Group: {email} ({role}) [id: {perm_id}]"
-    elif perm_type == "domain":
-        domain = permission.get("domain", "unknown")
-        base = f"Domain: {domain} ({role}) [id: {perm_id}]"
-    else:
-        base = f"{perm_type} ({role}) [id: {perm_id}]"
+    grantee = _PERMISSION_GRANTEE_FORMATTERS.get(
+        permission.get("type"), _format_unknown_grantee
+    )(permission)
+    base = f"{grantee} ({permission.get('role', 'unknown')}) [id: {permission.get('id', '')}]"
 
     extras = []
     if permission.get("expirationTime"):
@@ -174,6 +180,26 @@ DRIVE_QUERY_PATTERNS = [
     re.compile(r"\bmimeType\s*(=|!=)\b", re.IGNORECASE),  # mimeType operators
 ]
 
+# Single alternation over all patterns so detection is one regex scan per query
+DRIVE_QUERY_COMBINED = re.compile(
+    "|".join(f"(?:{pattern.pattern})" for pattern in DRIVE_QUERY_PATTERNS),
+    re.IGNORECASE,
+)
+
+# Backslashes and single quotes must be escaped inside Drive query string literals
+_DRIVE_QUERY_ESCAPE = str.maketrans({"\\": "\\\\", "'": "\\'"})
+
+
+def escape_drive_query_value(value: str) -> str:
+    """Escape a value for use inside a quoted Drive query literal."""
+    return value.translate(_DRIVE_QUERY_ESCAPE)
+
+
+# Only the file attributes rendered by the list/search formatters
+DRIVE_LIST_FIELDS = (
+    "nextPageToken, files(id, name, mimeType, webViewLink, modifiedTime, size)"
+)
+
 
 def build_drive_list_params(
     query: str,
@@ -198,7 +224,7 @@ def build_drive_list_params(
     list_params = {
         "q": query,
         "pageSize": page_size,
-        "fields": "nextPageToken, files(id, name, mimeType, webViewLink, iconLink, modifiedTime, size)",
+        "fields": DRIVE_LIST_FIELDS,
         "supportsAllDrives": True,
         "includeItemsFromAllDrives": include_items_from_all_drives,
     }
@@ -222,6 +248,27 @@ BASE_SHORTCUT_FIELDS = (
 )
 
 
+# IDs already confirmed not to be shortcuts, mapped to their (immutable) mimeType.
+# Bounded LRU so long-running servers don't grow without limit.
+_RESOLVED_ITEM_CACHE_MAX = 8192
+_resolved_item_mime_types: "OrderedDict[str, str]" = OrderedDict()
+
+
+def _remember_resolved_item(file_id: str, mime_type: Optional[str]) -> None:
+    """Record a non-shortcut item so later resolutions can skip the metadata fetch."""
+    if not mime_type or mime_type == SHORTCUT_MIME_TYPE:
+        return
+    _resolved_item_mime_types[file_id] = mime_type
+    _resolved_item_mime_types.move_to_end(file_id)
+    if len(_resolved_item_mime_types) > _RESOLVED_ITEM_CACHE_MAX:
+        _resolved_item_mime_types.popitem(last=False)
+
+
+def forget_resolved_item(file_id: str) -> None:
+    """Drop a cached resolution after an update that may invalidate it."""
+    _resolved_item_mime_types.pop(file_id, None)
+
+
 async def resolve_drive_item(
     service,
     file_id: str,
@@ -234,7 +281,16 @@ async def resolve_drive_item(
 
     Returns the resolved file ID and its metadata. Raises if shortcut targets loop
     or exceed max_depth to avoid infinite recursion.
+
+    When no extra_fields are requested and the ID is already known not to be a
+    shortcut, returns immediately with only ``id`` and ``mimeType`` populated.
     """
+    if not extra_fields:
+        cached_mime_type = _resolved_item_mime_types.get(file_id)
+        if cached_mime_type is not None:
+            _resolved_item_mime_types.move_to_end(file_id)
+            return file_id, {"id": file_id, "mimeType": cached_mime_type}
+
     current_id = file_id
     depth = 0
     fields = BASE_SHORTCUT_FIELDS
@@ -249,6 +305,7 @@ async def resolve_drive_item(
         )
         mime_type = metadata.get("mimeType")
         if mime_type != SHORTCUT_MIME_TYPE:
+            _remember_resolved_item(current_id, mime_type)
             return current_id, metadata
 
         shortcut_details = metadata.get("shortcutDetails") or {}
@@ -264,6 +321,13 @@ async def resolve_drive_item(
         current_id = target_id
 
 
+def _ensure_folder(resolved_id: str, folder_id: str, mime_type: Optional[str]) -> None:
+    if mime_type != FOLDER_MIME_TYPE:
+        raise Exception(
+            f"Resolved ID '{resolved_id}' (from '{folder_id}') is not a folder; mimeType={mime_type}."
+        )
+
+
 async def resolve_folder_id(
     service,
     folder_id: str,
@@ -278,9 +342,57 @@ async def resolve_folder_id(
         folder_id,
         max_depth=max_depth,
     )
-    mime_type = metadata.get("mimeType")
-    if mime_type != FOLDER_MIME_TYPE:
-        raise Exception(
-            f"Resolved ID '{resolved_id}' (from '{folder_id}') is not a folder; mimeType={mime_type}."
-        )
+    _ensure_folder(resolved_id, folder_id, metadata.get("mimeType"))
     return resolved_id
+
+
+# Drive batches above ~25 sub-requests start failing with HTTP 500s
+DRIVE_BATCH_MAX_REQUESTS = 25
+
+
+async def resolve_folder_ids(
+    service,
+    folder_ids: List[str],
+    *,
+    max_depth: int = 5,
+) -> List[str]:
+    """
+    Resolve several folder IDs, returning the resolved IDs in input order.
+
+    IDs not already known are fetched together in Drive batch requests (one HTTP
+    round trip per DRIVE_BATCH_MAX_REQUESTS IDs). Shortcuts found in the batch fall
+    back to resolve_folder_id to follow their targets.
+    """
+    unique_ids = list(dict.fromkeys(folder_ids))
+    pending = [fid for fid in unique_ids if fid not in _resolved_item_mime_types]
+
+    fetched: Dict[str, Any] = {}
+    if len(pending) > 1:
+
+        def _batch_callback(request_id, response, exception):
+            fetched[request_id] = exception if exception is not None else response
+
+        for start in range(0, len(pending), DRIVE_BATCH_MAX_REQUESTS):
+            batch = service.new_batch_http_request(callback=_batch_callback)
+            for fid in pending[start : start + DRIVE_BATCH_MAX_REQUESTS]:
+                batch.add(
+                    service.files().get(
+                        fileId=fid, fields=BASE_SHORTCUT_FIELDS, supportsAllDrives=True
+                    ),
+                    request_id=fid,
+                )
+            await asyncio.to_thread(batch.execute)
+
+    resolved: Dict[str, str] = {}
+    for fid in unique_ids:
+        metadata = fetched.get(fid)
+        if isinstance(metadata, Exception):
+            raise metadata
+        if metadata is not None and metadata.get("mimeType") != SHORTCUT_MIME_TYPE:
+            mime_type = metadata.get("mimeType")
+            _remember_resolved_item(fid, mime_type)
+            _ensure_folder(fid, fid, mime_type)
+            resolved[fid] = fid
+        else:
+            resolved[fid] = await resolve_folder_id(service, fid, max_depth=max_depth)
+    return [resolved[fid] for fid in folder_ids]
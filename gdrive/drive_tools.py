@@ -7,13 +7,19 @@ This module provides MCP tools for interacting with Google Drive API.
 import asyncio
 import logging
 import io
+import os
 import httpx
 import base64
 import ipaddress
+import multiprocessing
 import socket
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from contextlib import asynccontextmanager
 
-from typing import AsyncIterator, Optional, List, Dict, Any
+from typing import AsyncIterator, Iterator, Optional, List, Dict, Any, Tuple
 from tempfile import NamedTemporaryFile
 from urllib.parse import urljoin, urlparse, urlunparse
 from urllib.request import url2pathname
@@ -29,14 +35,19 @@ from core.utils import extract_office_xml_text, handle_http_errors, validate_fil
 from core.server import server
 from core.config import get_transport_mode
 from gdrive.drive_helpers import (
-    DRIVE_QUERY_PATTERNS,
+    DRIVE_QUERY_COMBINED,
     FOLDER_MIME_TYPE,
+    SHORTCUT_MIME_TYPE,
     build_drive_list_params,
     check_public_link_permission,
+    escape_drive_query_value,
+    forget_resolved_item,
     format_permission_info,
     get_drive_image_url,
+    is_public_link_permission,
     resolve_drive_item,
     resolve_folder_id,
+    resolve_folder_ids,
     validate_expiration_time,
     validate_share_role,
     validate_share_type,
@@ -44,10 +55,113 @@ from gdrive.drive_helpers import (
 
 logger = logging.getLogger(__name__)
 
-DOWNLOAD_CHUNK_SIZE_BYTES = 256 * 1024  # 256 KB
-UPLOAD_CHUNK_SIZE_BYTES = 5 * 1024 * 1024  # 5 MB (Google recommended minimum)
+_CHUNK_GRANULARITY_BYTES = 256 * 1024  # Drive resumable chunks must be 256 KB multiples
+
+
+def _chunk_size_from_env(env_var: str, default_bytes: int) -> int:
+    """
+    Read a transfer chunk size (in MB) from the environment.
+
+    Values are rounded down to Drive's 256 KB chunk granularity; invalid values
+    fall back to the default.
+    """
+    raw_value = os.getenv(env_var, "").strip()
+    if not raw_value:
+        return default_bytes
+    try:
+        size_bytes = int(float(raw_value) * 1024 * 1024)
+    except ValueError:
+        logger.warning(f"Ignoring invalid {env_var}={raw_value!r}; using default")
+        return default_bytes
+    return max(
+        _CHUNK_GRANULARITY_BYTES, size_bytes - size_bytes % _CHUNK_GRANULARITY_BYTES
+    )
+
+
+DOWNLOAD_CHUNK_SIZE_BYTES = _chunk_size_from_env(
+    "GDRIVE_DOWNLOAD_CHUNK_MB", 8 * 1024 * 1024
+)  # 8 MB
+UPLOAD_CHUNK_SIZE_BYTES = _chunk_size_from_env(
+    "GDRIVE_UPLOAD_CHUNK_MB", 16 * 1024 * 1024
+)  # 16 MB
 MAX_DOWNLOAD_BYTES = 2 * 1024 * 1024 * 1024  # 2 GB safety limit for URL downloads
 
+# MIME families that are decoded as text without sniffing, or never decoded at all
+_TEXTUAL_MIME_PREFIXES = ("text/", "application/json", "application/xml", "application/csv")
+_BINARY_MIME_PREFIXES = (
+    "image/",
+    "audio/",
+    "video/",
+    "application/pdf",
+    "application/zip",
+    "application/octet-stream",
+)
+_BINARY_SNIFF_BYTES = 4096
+
+
+# Office XML parsing is CPU-bound; large files go to worker processes so they
+# neither hold the GIL nor block the event loop.
+_OFFICE_EXTRACT_PROCESS_MIN_BYTES = 1024 * 1024  # 1 MB
+_office_extract_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_office_extract_pool() -> ProcessPoolExecutor:
+    """Create the Office extraction process pool on first use."""
+    global _office_extract_pool
+    if _office_extract_pool is None:
+        # spawn avoids forking a process that already runs event-loop and I/O threads
+        _office_extract_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count() or 1,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _office_extract_pool
+
+
+async def _extract_office_text(file_bytes: bytes, mime_type: str) -> Optional[str]:
+    """
+    Run extract_office_xml_text off the event loop.
+
+    Small files use a worker thread; anything larger than
+    _OFFICE_EXTRACT_PROCESS_MIN_BYTES is parsed in the process pool.
+    """
+    global _office_extract_pool
+    if len(file_bytes) < _OFFICE_EXTRACT_PROCESS_MIN_BYTES:
+        return await asyncio.to_thread(extract_office_xml_text, file_bytes, mime_type)
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(
+            _get_office_extract_pool(), extract_office_xml_text, file_bytes, mime_type
+        )
+    except BrokenProcessPool as e:
+        logger.warning(
+            f"[get_drive_file_content] Office extraction pool failed ({e}); retrying in-thread"
+        )
+        _office_extract_pool = None
+        return await asyncio.to_thread(extract_office_xml_text, file_bytes, mime_type)
+
+
+def _decode_text_content(content: bytes, mime_type: str) -> Optional[str]:
+    """
+    Decode downloaded bytes as UTF-8, skipping the attempt for known binary payloads.
+
+    Binary MIME families are rejected outright; unknown types are sniffed for NUL
+    bytes in the leading block so large binaries never go through a full decode.
+
+    Returns:
+        Optional[str]: The decoded text, or None if the content is not UTF-8 text.
+    """
+    if mime_type.startswith(_BINARY_MIME_PREFIXES):
+        return None
+    if (
+        not mime_type.startswith(_TEXTUAL_MIME_PREFIXES)
+        and b"\x00" in content[:_BINARY_SNIFF_BYTES]
+    ):
+        return None
+    try:
+        return content.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+
 
 @server.tool()
 @handle_http_errors("search_drive_files", is_read_only=True, service_type="drive")
@@ -83,7 +197,7 @@ async def search_drive_files(
 
     # Check if the query looks like a structured Drive query or free text
     # Look for Drive API operators and structured query patterns
-    is_structured_query = any(pattern.search(query) for pattern in DRIVE_QUERY_PATTERNS)
+    is_structured_query = DRIVE_QUERY_COMBINED.search(query) is not None
 
     if is_structured_query:
         final_query = query
@@ -92,7 +206,7 @@ async def search_drive_files(
         )
     else:
         # For free text queries, wrap in fullText contains
-        escaped_query = query.replace("'", "\\'")
+        escaped_query = escape_drive_query_value(query)
         final_query = f"fullText contains '{escaped_query}'"
         logger.info(
             f"[search_drive_files] Reformatting free text query '{query}' to '{final_query}'"
@@ -168,11 +282,14 @@ async def get_drive_file_content(
         else service.files().get_media(fileId=file_id)
     )
     fh = io.BytesIO()
-    downloader = MediaIoBaseDownload(fh, request_obj)
-    loop = asyncio.get_event_loop()
+    downloader = MediaIoBaseDownload(
+        fh, request_obj, chunksize=DOWNLOAD_CHUNK_SIZE_BYTES
+    )
+    loop = asyncio.get_running_loop()
+    next_chunk = downloader.next_chunk
     done = False
     while not done:
-        status, done = await loop.run_in_executor(None, downloader.next_chunk)
+        status, done = await loop.run_in_executor(None, next_chunk)
 
     file_content_bytes = fh.getvalue()
 
@@ -183,24 +300,16 @@ async def get_drive_file_content(
         "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
     }
 
+    body_text = None
     if mime_type in office_mime_types:
-        office_text = extract_office_xml_text(file_content_bytes, mime_type)
-        if office_text:
-            body_text = office_text
-        else:
-            # Fallback: try UTF-8; otherwise flag binary
-            try:
-                body_text = file_content_bytes.decode("utf-8")
-            except UnicodeDecodeError:
-                body_text = (
-                    f"[Binary or unsupported text encoding for mimeType '{mime_type}' - "
-                    f"{len(file_content_bytes)} bytes]"
-                )
-    else:
-        # For non-Office files (including Google native files), try UTF-8 decode directly
-        try:
-            body_text = file_content_bytes.decode("utf-8")
-        except UnicodeDecodeError:
+        body_text = await _extract_office_text(file_content_bytes, mime_type)
+
+    if not body_text:
+        # Google native files are exported as text, so sniff the exported type
+        body_text = _decode_text_content(
+            file_content_bytes, export_mime_type or mime_type
+        )
+        if body_text is None:
             body_text = (
                 f"[Binary or unsupported text encoding for mimeType '{mime_type}' - "
                 f"{len(file_content_bytes)} bytes]"
@@ -325,11 +434,14 @@ async def get_drive_file_download_url(
     )
 
     fh = io.BytesIO()
-    downloader = MediaIoBaseDownload(fh, request_obj)
-    loop = asyncio.get_event_loop()
+    downloader = MediaIoBaseDownload(
+        fh, request_obj, chunksize=DOWNLOAD_CHUNK_SIZE_BYTES
+    )
+    loop = asyncio.get_running_loop()
+    next_chunk = downloader.next_chunk
     done = False
     while not done:
-        status, done = await loop.run_in_executor(None, downloader.next_chunk)
+        status, done = await loop.run_in_executor(None, next_chunk)
 
     file_content_bytes = fh.getvalue()
     size_bytes = len(file_content_bytes)
@@ -356,12 +468,9 @@ async def get_drive_file_download_url(
     try:
         storage = get_attachment_storage()
 
-        # Encode bytes to base64 (as expected by AttachmentStorage)
-        base64_data = base64.urlsafe_b64encode(file_content_bytes).decode("utf-8")
-
-        # Save attachment to local disk
+        # Hand over the raw bytes; a base64 round trip would only add copies
         result = storage.save_attachment(
-            base64_data=base64_data,
+            file_bytes=file_content_bytes,
             filename=output_filename,
             mime_type=output_mime_type,
         )
@@ -616,29 +725,34 @@ async def create_drive_file(
 
             logger.info(f"[create_drive_file] Reading local file: {file_path}")
 
-            # Read file and upload
-            file_data = await asyncio.to_thread(path_obj.read_bytes)
-            total_bytes = len(file_data)
-            logger.info(f"[create_drive_file] Read {total_bytes} bytes from local file")
-
-            media = MediaIoBaseUpload(
-                io.BytesIO(file_data),
-                mimetype=mime_type,
-                resumable=True,
-                chunksize=UPLOAD_CHUNK_SIZE_BYTES,
+            # Upload straight from the open file; the client reads it chunk by chunk
+            total_bytes = path_obj.stat().st_size
+            logger.info(
+                f"[create_drive_file] Uploading {total_bytes} bytes from local file"
             )
 
-            logger.info("[create_drive_file] Starting upload to Google Drive...")
-            created_file = await asyncio.to_thread(
-                service.files()
-                .create(
-                    body=file_metadata,
-                    media_body=media,
-                    fields="id, name, webViewLink",
-                    supportsAllDrives=True,
+            local_file = await asyncio.to_thread(open, path_obj, "rb")
+            try:
+                media = MediaIoBaseUpload(
+                    local_file,
+                    mimetype=mime_type,
+                    resumable=True,
+                    chunksize=UPLOAD_CHUNK_SIZE_BYTES,
                 )
-                .execute
-            )
+
+                logger.info("[create_drive_file] Starting upload to Google Drive...")
+                created_file = await asyncio.to_thread(
+                    service.files()
+                    .create(
+                        body=file_metadata,
+                        media_body=media,
+                        fields="id, name, webViewLink",
+                        supportsAllDrives=True,
+                    )
+                    .execute
+                )
+            finally:
+                local_file.close()
         # Handle HTTP/HTTPS URLs
         elif parsed_url.scheme in ("http", "https"):
             # when running in stateless mode, deployment may not have access to local file system
@@ -1279,6 +1393,108 @@ async def import_to_google_doc(
     return confirmation
 
 
+def _meta_cache_ttl_from_env() -> float:
+    raw_value = os.getenv("DRIVE_META_TTL_SEC", "").strip()
+    if not raw_value:
+        return 30.0
+    try:
+        return max(0.0, float(raw_value))
+    except ValueError:
+        logger.warning(f"Ignoring invalid DRIVE_META_TTL_SEC={raw_value!r}; using default")
+        return 30.0
+
+
+# Short-lived cache of get_drive_file_permissions metadata, keyed by
+# (user_google_email, file_id); a TTL of 0 disables it
+_FILE_PERMISSIONS_CACHE_TTL_SEC = _meta_cache_ttl_from_env()
+_FILE_PERMISSIONS_CACHE_MAX = 1024
+_file_permissions_cache: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = (
+    OrderedDict()
+)
+
+
+def _get_cached_file_permissions(
+    user_google_email: str, file_id: str
+) -> Optional[Dict[str, Any]]:
+    key = (user_google_email, file_id)
+    entry = _file_permissions_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, metadata = entry
+    if expires_at <= time.monotonic():
+        del _file_permissions_cache[key]
+        return None
+    _file_permissions_cache.move_to_end(key)
+    return metadata
+
+
+def _cache_file_permissions(
+    user_google_email: str, file_id: str, metadata: Dict[str, Any]
+) -> None:
+    if _FILE_PERMISSIONS_CACHE_TTL_SEC <= 0:
+        return
+    key = (user_google_email, file_id)
+    _file_permissions_cache[key] = (
+        time.monotonic() + _FILE_PERMISSIONS_CACHE_TTL_SEC,
+        metadata,
+    )
+    _file_permissions_cache.move_to_end(key)
+    if len(_file_permissions_cache) > _FILE_PERMISSIONS_CACHE_MAX:
+        _file_permissions_cache.popitem(last=False)
+
+
+def _forget_file_permissions(file_id: str) -> None:
+    """Drop cached metadata for a file after it was changed, for every user."""
+    for key in [key for key in _file_permissions_cache if key[1] == file_id]:
+        del _file_permissions_cache[key]
+
+
+def _iter_file_permission_lines(
+    file_id: str, file_metadata: Dict[str, Any]
+) -> Iterator[str]:
+    """Yield the report lines for get_drive_file_permissions."""
+    yield f"File: {file_metadata.get('name', 'Unknown')}"
+    yield f"ID: {file_id}"
+    yield f"Type: {file_metadata.get('mimeType', 'Unknown')}"
+    yield f"Size: {file_metadata.get('size', 'N/A')} bytes"
+    yield f"Modified: {file_metadata.get('modifiedTime', 'N/A')}"
+    yield ""
+    yield "Sharing Status:"
+    yield f"  Shared: {file_metadata.get('shared', False)}"
+
+    sharing_user = file_metadata.get("sharingUser")
+    if sharing_user:
+        yield f"  Shared by: {sharing_user.get('displayName', 'Unknown')} ({sharing_user.get('emailAddress', 'Unknown')})"
+
+    # The public-link check rides along with rendering so the ACL is walked once
+    has_public_link = False
+    permissions = file_metadata.get("permissions", [])
+    if permissions:
+        yield f"  Number of permissions: {len(permissions)}"
+        yield "  Permissions:"
+        for perm in permissions:
+            has_public_link = has_public_link or is_public_link_permission(perm)
+            yield f"    - {format_permission_info(perm)}"
+    else:
+        yield "  No additional permissions (private file)"
+
+    yield ""
+    yield "URLs:"
+    yield f"  View Link: {file_metadata.get('webViewLink', 'N/A')}"
+
+    # webContentLink is only available for files that can be downloaded
+    web_content_link = file_metadata.get("webContentLink")
+    if web_content_link:
+        yield f"  Direct Download Link: {web_content_link}"
+
+    yield ""
+    if has_public_link:
+        yield "✅ This file is shared with 'Anyone with the link' - it can be inserted into Google Docs"
+    else:
+        yield "❌ This file is NOT shared with 'Anyone with the link' - it cannot be inserted into Google Docs"
+        yield "   To fix: Right-click the file in Google Drive → Share → Anyone with the link → Viewer"
+
+
 @server.tool()
 @handle_http_errors(
     "get_drive_file_permissions", is_read_only=True, service_type="drive"
@@ -1307,87 +1523,56 @@ async def get_drive_file_permissions(
     file_id = resolved_file_id
 
     try:
-        # Get comprehensive file metadata including permissions with details
-        file_metadata = await asyncio.to_thread(
-            service.files()
-            .get(
-                fileId=file_id,
-                fields="id, name, mimeType, size, modifiedTime, owners, "
-                "permissions(id, type, role, emailAddress, domain, expirationTime, permissionDetails), "
-                "webViewLink, webContentLink, shared, sharingUser, viewersCanCopyContent",
-                supportsAllDrives=True,
-            )
-            .execute
-        )
-
-        # Format the response
-        output_parts = [
-            f"File: {file_metadata.get('name', 'Unknown')}",
-            f"ID: {file_id}",
-            f"Type: {file_metadata.get('mimeType', 'Unknown')}",
-            f"Size: {file_metadata.get('size', 'N/A')} bytes",
-            f"Modified: {file_metadata.get('modifiedTime', 'N/A')}",
-            "",
-            "Sharing Status:",
-            f"  Shared: {file_metadata.get('shared', False)}",
-        ]
-
-        # Add sharing user if available
-        sharing_user = file_metadata.get("sharingUser")
-        if sharing_user:
-            output_parts.append(
-                f"  Shared by: {sharing_user.get('displayName', 'Unknown')} ({sharing_user.get('emailAddress', 'Unknown')})"
-            )
-
-        # Process permissions
-        permissions = file_metadata.get("permissions", [])
-        if permissions:
-            output_parts.append(f"  Number of permissions: {len(permissions)}")
-            output_parts.append("  Permissions:")
-            for perm in permissions:
-                output_parts.append(f"    - {format_permission_info(perm)}")
-        else:
-            output_parts.append("  No additional permissions (private file)")
-
-        # Add URLs
-        output_parts.extend(
-            [
-                "",
-                "URLs:",
-                f"  View Link: {file_metadata.get('webViewLink', 'N/A')}",
-            ]
-        )
-
-        # webContentLink is only available for files that can be downloaded
-        web_content_link = file_metadata.get("webContentLink")
-        if web_content_link:
-            output_parts.append(f"  Direct Download Link: {web_content_link}")
-
-        has_public_link = check_public_link_permission(permissions)
-
-        if has_public_link:
-            output_parts.extend(
-                [
-                    "",
-                    "✅ This file is shared with 'Anyone with the link' - it can be inserted into Google Docs",
-                ]
-            )
-        else:
-            output_parts.extend(
-                [
-                    "",
-                    "❌ This file is NOT shared with 'Anyone with the link' - it cannot be inserted into Google Docs",
-                    "   To fix: Right-click the file in Google Drive → Share → Anyone with the link → Viewer",
-                ]
+        file_metadata = _get_cached_file_permissions(user_google_email, file_id)
+        if file_metadata is None:
+            # Get comprehensive file metadata including permissions with details
+            file_metadata = await asyncio.to_thread(
+                service.files()
+                .get(
+                    fileId=file_id,
+                    fields="name, mimeType, size, modifiedTime, "
+                    "permissions(id, type, role, emailAddress, domain, expirationTime, permissionDetails), "
+                    "webViewLink, webContentLink, shared, sharingUser(displayName, emailAddress)",
+                    supportsAllDrives=True,
+                )
+                .execute
             )
+            _cache_file_permissions(user_google_email, file_id, file_metadata)
 
-        return "\n".join(output_parts)
+        return "\n".join(_iter_file_permission_lines(file_id, file_metadata))
 
     except Exception as e:
         logger.error(f"Error getting file permissions: {e}")
         return f"Error getting file permissions: {e}"
 
 
+def _iter_public_access_lines(
+    file_name: str,
+    files: List[Dict[str, Any]],
+    file_id: str,
+    file_metadata: Dict[str, Any],
+) -> Iterator[str]:
+    """Yield the report lines for check_drive_file_public_access."""
+    if len(files) > 1:
+        yield f"Found multiple files with name '{file_name}', most recently modified first:"
+        yield from (f"  - {f['name']} (ID: {f['id']})" for f in files)
+        yield "\nChecking the most recently modified file..."
+        yield ""
+
+    yield f"File: {file_metadata['name']}"
+    yield f"ID: {file_id}"
+    yield f"Type: {file_metadata['mimeType']}"
+    yield f"Shared: {file_metadata.get('shared', False)}"
+    yield ""
+
+    if check_public_link_permission(file_metadata.get("permissions", [])):
+        yield "✅ PUBLIC ACCESS ENABLED - This file can be inserted into Google Docs"
+        yield f"Use with insert_doc_image_url: {get_drive_image_url(file_id)}"
+    else:
+        yield "❌ NO PUBLIC ACCESS - Cannot insert into Google Docs"
+        yield "Fix: Drive → Share → 'Anyone with the link' → 'Viewer'"
+
+
 @server.tool()
 @handle_http_errors(
     "check_drive_file_public_access", is_read_only=True, service_type="drive"
@@ -1411,13 +1596,16 @@ async def check_drive_file_public_access(
     logger.info(f"[check_drive_file_public_access] Searching for {file_name}")
 
     # Search for the file
-    escaped_name = file_name.replace("'", "\\'")
+    escaped_name = escape_drive_query_value(file_name)
     query = f"name = '{escaped_name}'"
 
+    # Fetch sharing state with the search so the common case needs one request
     list_params = {
         "q": query,
-        "pageSize": 10,
-        "fields": "files(id, name, mimeType, webViewLink)",
+        # Two results are enough to tell a unique name from a duplicated one
+        "pageSize": 2,
+        "orderBy": "modifiedTime desc",
+        "fields": "files(id, name, mimeType, shared, permissions(type, role))",
         "supportsAllDrives": True,
         "includeItemsFromAllDrives": True,
     }
@@ -1428,61 +1616,74 @@ async def check_drive_file_public_access(
     if not files:
         return f"No file found with name '{file_name}'"
 
-    if len(files) > 1:
-        output_parts = [f"Found {len(files)} files with name '{file_name}':"]
-        for f in files:
-            output_parts.append(f"  - {f['name']} (ID: {f['id']})")
-        output_parts.append("\nChecking the first file...")
-        output_parts.append("")
-    else:
-        output_parts = []
-
     # Check permissions for the first file
-    file_id = files[0]["id"]
-    resolved_file_id, _ = await resolve_drive_item(service, file_id)
-    file_id = resolved_file_id
+    file_metadata = files[0]
+    file_id = file_metadata["id"]
 
-    # Get detailed permissions
-    file_metadata = await asyncio.to_thread(
-        service.files()
-        .get(
-            fileId=file_id,
-            fields="id, name, mimeType, permissions, webViewLink, webContentLink, shared",
-            supportsAllDrives=True,
+    # Shortcuts carry no sharing state of their own; fetch the target's instead
+    if file_metadata.get("mimeType") == SHORTCUT_MIME_TYPE:
+        file_id, _ = await resolve_drive_item(service, file_id)
+        file_metadata = await asyncio.to_thread(
+            service.files()
+            .get(
+                fileId=file_id,
+                fields="name, mimeType, shared, permissions(type, role)",
+                supportsAllDrives=True,
+            )
+            .execute
         )
-        .execute
-    )
-
-    permissions = file_metadata.get("permissions", [])
 
-    has_public_link = check_public_link_permission(permissions)
-
-    output_parts.extend(
-        [
-            f"File: {file_metadata['name']}",
-            f"ID: {file_id}",
-            f"Type: {file_metadata['mimeType']}",
-            f"Shared: {file_metadata.get('shared', False)}",
-            "",
-        ]
+    return "\n".join(
+        _iter_public_access_lines(file_name, files, file_id, file_metadata)
     )
 
-    if has_public_link:
-        output_parts.extend(
-            [
-                "✅ PUBLIC ACCESS ENABLED - This file can be inserted into Google Docs",
-                f"Use with insert_doc_image_url: {get_drive_image_url(file_id)}",
-            ]
-        )
-    else:
-        output_parts.extend(
-            [
-                "❌ NO PUBLIC ACCESS - Cannot insert into Google Docs",
-                "Fix: Drive → Share → 'Anyone with the link' → 'Viewer'",
-            ]
-        )
 
-    return "\n".join(output_parts)
+_UPDATE_CURRENT_FILE_FIELDS = (
+    "name, description, mimeType, parents, starred, trashed, webViewLink, "
+    "writersCanShare, copyRequiresWriterPermission, properties"
+)
+# The update report only renders these; old values come from the pre-update read
+_UPDATE_RETURN_FIELDS = "name, webViewLink"
+
+
+def _unchanged(value: Any) -> Any:
+    return value
+
+
+# (Drive field, normalizer, change description) for update_drive_file's report.
+# A change is reported when the normalized old and new values differ.
+_UPDATE_CHANGE_REPORTS = (
+    ("name", _unchanged, lambda old, new: f"Name: '{old}' → '{new}'"),
+    (
+        "description",
+        lambda value: value or "",
+        lambda old, new: f"Description: {old or '(empty)'} → {new or '(empty)'}",
+    ),
+    (
+        "starred",
+        _unchanged,
+        lambda old, new: f"File {'starred' if new else 'unstarred'}",
+    ),
+    (
+        "trashed",
+        _unchanged,
+        lambda old, new: f"File {'moved to trash' if new else 'restored from trash'}",
+    ),
+    (
+        "writersCanShare",
+        _unchanged,
+        lambda old, new: f"Writers {'can' if new else 'cannot'} share the file",
+    ),
+    (
+        "copyRequiresWriterPermission",
+        _unchanged,
+        lambda old, new: (
+            "Copying requires writer permission"
+            if new
+            else "Copying doesn't require writer permission"
+        ),
+    ),
+)
 
 
 @server.tool()
@@ -1530,16 +1731,27 @@ async def update_drive_file(
     """
     logger.info(f"[update_drive_file] Updating file {file_id} for {user_google_email}")
 
-    current_file_fields = (
-        "name, description, mimeType, parents, starred, trashed, webViewLink, "
-        "writersCanShare, copyRequiresWriterPermission, properties"
-    )
-    resolved_file_id, current_file = await resolve_drive_item(
-        service,
-        file_id,
-        extra_fields=current_file_fields,
+    def _split_parent_ids(parent_arg: Optional[str]) -> List[str]:
+        if not parent_arg:
+            return []
+        return [part.strip() for part in parent_arg.split(",") if part.strip()]
+
+    add_parent_ids = _split_parent_ids(add_parents)
+    remove_parent_ids = _split_parent_ids(remove_parents)
+
+    # File metadata and all parent folders are looked up concurrently; the
+    # parents share a single Drive batch request
+    (resolved_file_id, current_file), resolved_parent_ids = await asyncio.gather(
+        resolve_drive_item(
+            service,
+            file_id,
+            extra_fields=_UPDATE_CURRENT_FILE_FIELDS,
+        ),
+        resolve_folder_ids(service, add_parent_ids + remove_parent_ids),
     )
     file_id = resolved_file_id
+    resolved_add_parents = ",".join(resolved_parent_ids[: len(add_parent_ids)])
+    resolved_remove_parents = ",".join(resolved_parent_ids[len(add_parent_ids) :])
 
     # Build the update body with only specified fields
     update_body = {}
@@ -1560,27 +1772,11 @@ async def update_drive_file(
     if properties is not None:
         update_body["properties"] = properties
 
-    async def _resolve_parent_arguments(parent_arg: Optional[str]) -> Optional[str]:
-        if not parent_arg:
-            return None
-        parent_ids = [part.strip() for part in parent_arg.split(",") if part.strip()]
-        if not parent_ids:
-            return None
-
-        resolved_ids = []
-        for parent in parent_ids:
-            resolved_parent = await resolve_folder_id(service, parent)
-            resolved_ids.append(resolved_parent)
-        return ",".join(resolved_ids)
-
-    resolved_add_parents = await _resolve_parent_arguments(add_parents)
-    resolved_remove_parents = await _resolve_parent_arguments(remove_parents)
-
     # Build query parameters for parent changes
     query_params = {
         "fileId": file_id,
         "supportsAllDrives": True,
-        "fields": "id, name, description, mimeType, parents, starred, trashed, webViewLink, writersCanShare, copyRequiresWriterPermission, properties",
+        "fields": _UPDATE_RETURN_FIELDS,
     }
 
     if resolved_add_parents:
@@ -1592,10 +1788,18 @@ async def update_drive_file(
     if update_body:
         query_params["body"] = update_body
 
-    # Perform the update
-    updated_file = await asyncio.to_thread(
-        service.files().update(**query_params).execute
-    )
+    # Perform the update; a call with nothing to change would only echo
+    # back the metadata we already hold
+    if update_body or resolved_add_parents or resolved_remove_parents:
+        updated_file = await asyncio.to_thread(
+            service.files().update(**query_params).execute
+        )
+        _forget_file_permissions(file_id)
+        # Trashed items and retyped files must be looked up afresh next time
+        if "trashed" in update_body or "mimeType" in update_body:
+            forget_resolved_item(file_id)
+    else:
+        updated_file = current_file
 
     # Build response message
     output_parts = [
@@ -1605,47 +1809,17 @@ async def update_drive_file(
 
     # Report what changed
     changes = []
-    if name is not None and name != current_file.get("name"):
-        changes.append(f"   • Name: '{current_file.get('name')}' → '{name}'")
-    if description is not None:
-        old_desc_value = current_file.get("description")
-        new_desc_value = description
-        should_report_change = (old_desc_value or "") != (new_desc_value or "")
-        if should_report_change:
-            old_desc_display = (
-                old_desc_value if old_desc_value not in (None, "") else "(empty)"
-            )
-            new_desc_display = (
-                new_desc_value if new_desc_value not in (None, "") else "(empty)"
-            )
-            changes.append(f"   • Description: {old_desc_display} → {new_desc_display}")
+    for field, normalize, describe in _UPDATE_CHANGE_REPORTS:
+        if field not in update_body:
+            continue
+        old_value = normalize(current_file.get(field))
+        new_value = normalize(update_body[field])
+        if old_value != new_value:
+            changes.append(f"   • {describe(old_value, new_value)}")
     if add_parents:
         changes.append(f"   • Added to folder(s): {add_parents}")
     if remove_parents:
         changes.append(f"   • Removed from folder(s): {remove_parents}")
-    current_starred = current_file.get("starred")
-    if starred is not None and starred != current_starred:
-        star_status = "starred" if starred else "unstarred"
-        changes.append(f"   • File {star_status}")
-    current_trashed = current_file.get("trashed")
-    if trashed is not None and trashed != current_trashed:
-        trash_status = "moved to trash" if trashed else "restored from trash"
-        changes.append(f"   • File {trash_status}")
-    current_writers_can_share = current_file.get("writersCanShare")
-    if writers_can_share is not None and writers_can_share != current_writers_can_share:
-        share_status = "can" if writers_can_share else "cannot"
-        changes.append(f"   • Writers {share_status} share the file")
-    current_copy_requires_writer_permission = current_file.get(
-        "copyRequiresWriterPermission"
-    )
-    if (
-        copy_requires_writer_permission is not None
-        and copy_requires_writer_permission != current_copy_requires_writer_permission
-    ):
-        copy_status = (
-            "requires" if copy_requires_writer_permission else "doesn't require"
-        )
-        changes.append(f"   • Copying {copy_status} writer permission")
     if properties:
         changes.append(f"   • Updated custom properties: {properties}")
 
@@ -1716,8 +1890,7 @@ async def get_drive_shareable_link(
     if permissions:
         output_parts.append("")
         output_parts.append("Current permissions:")
-        for perm in permissions:
-            output_parts.append(f"  - {format_permission_info(perm)}")
+        output_parts.extend(f"  - {format_permission_info(perm)}" for perm in permissions)
 
     return "\n".join(output_parts)
 
@@ -1806,6 +1979,8 @@ async def share_drive_file(
         service.permissions().create(**create_params).execute
     )
 
+    _forget_file_permissions(file_id)
+
     output_parts = [
         f"Successfully shared '{file_metadata.get('name', 'Unknown')}'",
         "",
@@ -1943,6 +2118,8 @@ async def batch_share_drive_file(
             results.append(f"  - {identifier}: Failed - {str(e)}")
             failure_count += 1
 
+    _forget_file_permissions(file_id)
+
     output_parts = [
         f"Batch share results for '{file_metadata.get('name', 'Unknown')}'",
         "",
@@ -2032,6 +2209,8 @@ async def update_drive_permission(
         .execute
     )
 
+    _forget_file_permissions(file_id)
+
     output_parts = [
         f"Successfully updated permission on '{file_metadata.get('name', 'Unknown')}'",
         "",
@@ -2077,6 +2256,8 @@ async def remove_drive_permission(
         .execute
     )
 
+    _forget_file_permissions(file_id)
+
     output_parts = [
         f"Successfully removed permission from '{file_metadata.get('name', 'Unknown')}'",
         "",
@@ -2216,6 +2397,8 @@ async def transfer_drive_ownership(
         .execute
     )
 
+    _forget_file_permissions(file_id)
+
     output_parts = [
         f"Successfully transferred ownership of '{file_metadata.get('name', 'Unknown')}'",
         "",
@@ -2399,4 +2582,6 @@ async def set_drive_file_permissions(
         output_parts.append("  - No changes (already configured)")
     output_parts.extend(["", f"View link: {file_metadata.get('webViewLink', 'N/A')}"])
 
+    _forget_file_permissions(file_id)
+
     return "\n".join(output_parts)
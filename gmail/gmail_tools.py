@@ -9,8 +9,13 @@ import asyncio
 import base64
 import ssl
 import mimetypes
+import random
+import re
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
 from html.parser import HTMLParser
-from typing import Annotated, Optional, List, Dict, Literal, Any
+from typing import Annotated, Optional, List, Dict, Literal, Any, Iterator, Tuple
 
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -18,8 +23,17 @@ from email.mime.base import MIMEBase
 from email import encoders
 from email.utils import formataddr
 
+import google_auth_httplib2
+from googleapiclient.errors import HttpError
+from googleapiclient.http import build_http
 from pydantic import Field
 
+# pybase64 uses SIMD kernels when installed; the stdlib codec is a drop-in fallback
+try:
+    from pybase64 import urlsafe_b64decode, urlsafe_b64encode
+except ImportError:
+    from base64 import urlsafe_b64decode, urlsafe_b64encode
+
 from auth.service_decorator import require_google_service
 from core.utils import handle_http_errors, validate_file_path
 from core.server import server
@@ -33,9 +47,95 @@ from auth.scopes import (
 logger = logging.getLogger(__name__)
 
 GMAIL_BATCH_SIZE = 25
-GMAIL_REQUEST_DELAY = 0.1
+GMAIL_MAX_CONCURRENT_REQUESTS = 5  # Max batch or single requests in flight per call
+# Thread batches at least this large are formatted off the event loop
+GMAIL_THREAD_FORMAT_OFFLOAD_MIN = 8
 HTML_BODY_TRUNCATE_LIMIT = 20000
 GMAIL_METADATA_HEADERS = ["Subject", "From", "To", "Cc", "Message-ID", "Date"]
+_METADATA_HEADER_LOOKUP = {name.lower(): name for name in GMAIL_METADATA_HEADERS}
+# Headers rendered for each message by _format_thread_content
+_THREAD_MESSAGE_HEADERS = [
+    "From",
+    "Date",
+    "Subject",
+    "Message-ID",
+    "In-Reply-To",
+    "References",
+]
+_THREAD_MESSAGE_HEADER_LOOKUP = {name.lower(): name for name in _THREAD_MESSAGE_HEADERS}
+
+
+class _HttpPool:
+    """
+    Fixed set of HTTP transports for requests executed in parallel threads.
+
+    httplib2.Http is not thread-safe, so concurrent requests must not share the
+    service's own transport. Borrowing a transport also bounds concurrency to
+    the pool size.
+    """
+
+    def __init__(self, service, size: int):
+        credentials = getattr(getattr(service, "_http", None), "credentials", None)
+        self._idle: asyncio.Queue = asyncio.Queue()
+        for _ in range(size):
+            # None makes execute() fall back to the service's transport
+            http = (
+                google_auth_httplib2.AuthorizedHttp(credentials, http=build_http())
+                if credentials is not None
+                else None
+            )
+            self._idle.put_nowait(http)
+
+    @asynccontextmanager
+    async def borrow(self):
+        http = await self._idle.get()
+        try:
+            yield http
+        finally:
+            self._idle.put_nowait(http)
+
+
+# Transient failures of single Gmail requests are retried with backoff
+GMAIL_MAX_FETCH_ATTEMPTS = 5
+GMAIL_MAX_RETRY_DELAY = 16
+_RETRYABLE_HTTP_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def _retry_delay(error: Optional[BaseException], attempt: int) -> Optional[float]:
+    """
+    Seconds to wait before retrying a failed request, or None if the error is
+    not transient. Honors Retry-After on rate-limit and server errors.
+    """
+    if isinstance(error, HttpError):
+        if error.resp.status not in _RETRYABLE_HTTP_STATUSES:
+            return None
+        retry_after = error.resp.get("retry-after", "")
+        if retry_after.isdigit():
+            return min(int(retry_after), GMAIL_MAX_RETRY_DELAY)
+    elif not isinstance(error, (ssl.SSLError, TimeoutError)):
+        return None
+    # Exponential backoff with jitter: ~1s, 2s, 4s, 8s
+    return min(2**attempt, GMAIL_MAX_RETRY_DELAY) + random.random()
+
+
+async def _execute_with_retry(request, http, tool_name: str, item: str):
+    """Execute a single API request, retrying transient failures."""
+    for attempt in range(GMAIL_MAX_FETCH_ATTEMPTS):
+        try:
+            return await asyncio.to_thread(request.execute, http=http)
+        except Exception as error:
+            delay = _retry_delay(error, attempt)
+            if delay is None:
+                raise
+            if attempt == GMAIL_MAX_FETCH_ATTEMPTS - 1:
+                logger.error(
+                    f"[{tool_name}] Transient error for {item} on final attempt: {error}"
+                )
+                raise
+            logger.warning(
+                f"[{tool_name}] Transient error for {item} on attempt {attempt + 1}: {error}. Retrying in {delay:.1f}s..."
+            )
+            await asyncio.sleep(delay)
 
 
 class _HTMLTextExtractor(HTMLParser):
@@ -100,38 +200,51 @@ def _extract_message_bodies(payload):
     html_body = ""
     parts = [payload] if "parts" not in payload else payload.get("parts", [])
 
-    part_queue = list(parts)  # Use a queue for BFS traversal of parts
+    part_queue = deque(parts)  # Use a queue for BFS traversal of parts
     while part_queue:
-        part = part_queue.pop(0)
+        part = part_queue.popleft()
         mime_type = part.get("mimeType", "")
-        body_data = part.get("body", {}).get("data")
+
+        # Only decode parts that can still fill an empty body slot; text
+        # attachments (parts with a filename) are never treated as the body
+        is_text = mime_type == "text/plain" and not text_body
+        is_html = mime_type == "text/html" and not html_body
+        body_data = (
+            part.get("body", {}).get("data")
+            if (is_text or is_html) and not part.get("filename")
+            else None
+        )
 
         if body_data:
             try:
-                decoded_data = base64.urlsafe_b64decode(body_data).decode(
+                decoded_data = urlsafe_b64decode(body_data).decode(
                     "utf-8", errors="ignore"
                 )
-                if mime_type == "text/plain" and not text_body:
+                if is_text:
                     text_body = decoded_data
-                elif mime_type == "text/html" and not html_body:
+                else:
                     html_body = decoded_data
             except Exception as e:
                 logger.warning(f"Failed to decode body part: {e}")
+            if text_body and html_body:
+                break
 
         # Add sub-parts to queue for multipart messages
         if mime_type.startswith("multipart/") and "parts" in part:
             part_queue.extend(part.get("parts", []))
 
     # Check the main payload if it has body data directly
-    if payload.get("body", {}).get("data"):
+    mime_type = payload.get("mimeType", "")
+    is_text = mime_type == "text/plain" and not text_body
+    is_html = mime_type == "text/html" and not html_body
+    if (is_text or is_html) and payload.get("body", {}).get("data"):
         try:
-            decoded_data = base64.urlsafe_b64decode(payload["body"]["data"]).decode(
+            decoded_data = urlsafe_b64decode(payload["body"]["data"]).decode(
                 "utf-8", errors="ignore"
             )
-            mime_type = payload.get("mimeType", "")
-            if mime_type == "text/plain" and not text_body:
+            if is_text:
                 text_body = decoded_data
-            elif mime_type == "text/html" and not html_body:
+            else:
                 html_body = decoded_data
         except Exception as e:
             logger.warning(f"Failed to decode main payload body: {e}")
@@ -151,22 +264,24 @@ def _format_body_content(text_body: str, html_body: str) -> str:
     Returns:
         Formatted body content string
     """
-    text_stripped = text_body.strip()
-    html_stripped = html_body.strip()
+    # isspace() answers "blank?" without copying the body the way strip() would
+    has_text = bool(text_body) and not text_body.isspace()
+    has_html = bool(html_body) and not html_body.isspace()
 
     # Detect useless fallback: HTML comments in text, or HTML is 50x+ longer
-    use_html = html_stripped and (
-        not text_stripped
-        or "<!--" in text_stripped
-        or len(html_stripped) > len(text_stripped) * 50
+    use_html = has_html and (
+        not has_text
+        or "<!--" in text_body
+        or len(html_body) > len(text_body) * 50
     )
 
     if use_html:
-        content = _html_to_text(html_stripped)
+        # _html_to_text collapses whitespace, so surrounding blanks need no strip
+        content = _html_to_text(html_body)
         if len(content) > HTML_BODY_TRUNCATE_LIMIT:
             content = content[:HTML_BODY_TRUNCATE_LIMIT] + "\n\n[Content truncated...]"
         return content
-    elif text_stripped:
+    elif has_text:
         return text_body
     else:
         return "[No readable content found]"
@@ -184,26 +299,27 @@ def _extract_attachments(payload: dict) -> List[Dict[str, Any]]:
     """
     attachments = []
 
-    def search_parts(part):
-        """Recursively search for attachments in message parts"""
+    # Depth-first walk with an explicit stack; sub-parts are pushed in reverse
+    # so attachments come out in document order
+    part_stack = [payload]
+    while part_stack:
+        part = part_stack.pop()
+        body = part.get("body") or {}
         # Check if this part is an attachment
-        if part.get("filename") and part.get("body", {}).get("attachmentId"):
+        if part.get("filename") and body.get("attachmentId"):
             attachments.append(
                 {
                     "filename": part["filename"],
                     "mimeType": part.get("mimeType", "application/octet-stream"),
-                    "size": part.get("body", {}).get("size", 0),
-                    "attachmentId": part["body"]["attachmentId"],
+                    "size": body.get("size", 0),
+                    "attachmentId": body["attachmentId"],
                 }
             )
 
-        # Recursively search sub-parts
-        if "parts" in part:
-            for subpart in part["parts"]:
-                search_parts(subpart)
+        subparts = part.get("parts")
+        if subparts:
+            part_stack.extend(reversed(subparts))
 
-    # Start searching from the root payload
-    search_parts(payload)
     return attachments
 
 
@@ -218,14 +334,56 @@ def _extract_headers(payload: dict, header_names: List[str]) -> Dict[str, str]:
     Returns:
         Dict mapping header names to their values
     """
-    headers = {}
-    target_headers = {name.lower(): name for name in header_names}
-    for header in payload.get("headers", []):
-        header_name_lower = header["name"].lower()
-        if header_name_lower in target_headers:
-            # Store using the original requested casing
-            headers[target_headers[header_name_lower]] = header["value"]
-    return headers
+    if header_names is GMAIL_METADATA_HEADERS:
+        target_headers = _METADATA_HEADER_LOOKUP
+    elif header_names is _THREAD_MESSAGE_HEADERS:
+        target_headers = _THREAD_MESSAGE_HEADER_LOOKUP
+    else:
+        target_headers = {name.lower(): name for name in header_names}
+    # Matching is case-insensitive; keys use the original requested casing
+    return {
+        target_headers[name_lower]: header["value"]
+        for header in payload.get("headers", ())
+        if (name_lower := header["name"].lower()) in target_headers
+    }
+
+
+_GENERATOR_LINE_BREAKS = re.compile(r"\r\n|\r|\n")
+_MAX_UNFOLDED_HEADER_LENGTH = 78
+
+
+def _build_simple_raw_message(
+    body: str, body_format: str, headers: List[tuple[str, str]]
+) -> Optional[bytes]:
+    """
+    Serialize a single-part ASCII message without the email generator.
+
+    Produces the same bytes as MIMEText(body, body_format).as_bytes() with the
+    given headers appended in order. Returns None when the message needs
+    anything the generator would add (non-ASCII content or header folding), so
+    the caller can fall back to MIMEText.
+    """
+    if not body.isascii():
+        return None
+    header_lines = []
+    for name, value in headers:
+        line = f"{name}: {value}"
+        if (
+            not line.isascii()
+            or len(line) > _MAX_UNFOLDED_HEADER_LENGTH
+            or "\r" in line
+            or "\n" in line
+        ):
+            return None
+        header_lines.append(line)
+    return (
+        f'Content-Type: text/{body_format}; charset="us-ascii"\n'
+        "MIME-Version: 1.0\n"
+        "Content-Transfer-Encoding: 7bit\n"
+        + "".join(f"{line}\n" for line in header_lines)
+        + "\n"
+        + _GENERATOR_LINE_BREAKS.sub("\n", body)
+    ).encode("ascii")
 
 
 def _prepare_gmail_message(
@@ -346,9 +504,9 @@ def _prepare_gmail_message(
                 logger.error(f"Failed to attach {filename or file_path}: {e}")
                 continue
     else:
-        message = MIMEText(body, normalized_format)
+        message = None
 
-    message["Subject"] = reply_subject
+    headers = [("Subject", reply_subject)]
 
     # Add sender if provided
     if from_email:
@@ -357,31 +515,46 @@ def _prepare_gmail_message(
             safe_name = (
                 from_name.replace("\r", "").replace("\n", "").replace("\x00", "")
             )
-            message["From"] = formataddr((safe_name, from_email))
+            headers.append(("From", formataddr((safe_name, from_email))))
         else:
-            message["From"] = from_email
+            headers.append(("From", from_email))
 
     # Add recipients if provided
     if to:
-        message["To"] = to
+        headers.append(("To", to))
     if cc:
-        message["Cc"] = cc
+        headers.append(("Cc", cc))
     if bcc:
-        message["Bcc"] = bcc
+        headers.append(("Bcc", bcc))
 
     # Add reply headers for threading
     if in_reply_to:
-        message["In-Reply-To"] = in_reply_to
+        headers.append(("In-Reply-To", in_reply_to))
 
     if references:
-        message["References"] = references
+        headers.append(("References", references))
+
+    # Plain single-part ASCII messages skip the (slow) email generator
+    raw_bytes = None
+    if message is None:
+        raw_bytes = _build_simple_raw_message(body, normalized_format, headers)
+        if raw_bytes is None:
+            message = MIMEText(body, normalized_format)
+
+    if raw_bytes is None:
+        for name, value in headers:
+            message[name] = value
+        raw_bytes = message.as_bytes()
 
     # Encode message
-    raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
+    raw_message = urlsafe_b64encode(raw_bytes).decode()
 
     return raw_message, thread_id
 
 
+_GMAIL_WEB_URL_PREFIX = "https://mail.google.com/mail/u/0/#all/"
+
+
 def _generate_gmail_web_url(item_id: str, account_index: int = 0) -> str:
     """
     Generate Gmail web interface URL for a message or thread ID.
@@ -394,6 +567,8 @@ def _generate_gmail_web_url(item_id: str, account_index: int = 0) -> str:
     Returns:
         Gmail web interface URL that opens the message/thread in Gmail web interface
     """
+    if account_index == 0:
+        return _GMAIL_WEB_URL_PREFIX + item_id
     return f"https://mail.google.com/mail/u/{account_index}/#all/{item_id}"
 
 
@@ -413,43 +588,28 @@ def _format_gmail_results_plain(
     for i, msg in enumerate(messages, 1):
         # Handle potential null/undefined message objects
         if not msg or not isinstance(msg, dict):
-            lines.extend(
-                [
-                    f"  {i}. Message: Invalid message data",
-                    "     Error: Message object is null or malformed",
-                    "",
-                ]
+            lines.append(
+                f"  {i}. Message: Invalid message data\n"
+                "     Error: Message object is null or malformed\n"
             )
             continue
 
-        # Handle potential null/undefined values from Gmail API
-        message_id = msg.get("id")
-        thread_id = msg.get("threadId")
-
-        # Convert None, empty string, or missing values to "unknown"
-        if not message_id:
-            message_id = "unknown"
-        if not thread_id:
-            thread_id = "unknown"
-
-        if message_id != "unknown":
-            message_url = _generate_gmail_web_url(message_id)
-        else:
-            message_url = "N/A"
+        # Convert None, empty string, or missing values from the Gmail API to "unknown"
+        message_id = msg.get("id") or "unknown"
+        thread_id = msg.get("threadId") or "unknown"
+        message_url = (
+            _generate_gmail_web_url(message_id) if message_id != "unknown" else "N/A"
+        )
+        thread_url = (
+            _generate_gmail_web_url(thread_id) if thread_id != "unknown" else "N/A"
+        )
 
-        if thread_id != "unknown":
-            thread_url = _generate_gmail_web_url(thread_id)
-        else:
-            thread_url = "N/A"
-
-        lines.extend(
-            [
-                f"  {i}. Message ID: {message_id}",
-                f"     Web Link: {message_url}",
-                f"     Thread ID: {thread_id}",
-                f"     Thread Link: {thread_url}",
-                "",
-            ]
+        # One block per message; the trailing newline yields the blank separator line
+        lines.append(
+            f"  {i}. Message ID: {message_id}\n"
+            f"     Web Link: {message_url}\n"
+            f"     Thread ID: {thread_id}\n"
+            f"     Thread Link: {thread_url}\n"
         )
 
     lines.extend(
@@ -559,42 +719,27 @@ async def get_gmail_message_content(
 
     logger.info(f"[get_gmail_message_content] Using service for: {user_google_email}")
 
-    # Fetch message metadata first to get headers
-    message_metadata = await asyncio.to_thread(
+    # The full format carries headers as well as body parts, so one request suffices
+    message_full = await asyncio.to_thread(
         service.users()
         .messages()
         .get(
             userId="me",
             id=message_id,
-            format="metadata",
-            metadataHeaders=GMAIL_METADATA_HEADERS,
+            format="full",
         )
         .execute
     )
+    payload = message_full.get("payload", {})
 
-    headers = _extract_headers(
-        message_metadata.get("payload", {}), GMAIL_METADATA_HEADERS
-    )
+    headers = _extract_headers(payload, GMAIL_METADATA_HEADERS)
     subject = headers.get("Subject", "(no subject)")
     sender = headers.get("From", "(unknown sender)")
     to = headers.get("To", "")
     cc = headers.get("Cc", "")
     rfc822_msg_id = headers.get("Message-ID", "")
 
-    # Now fetch the full message to get the body parts
-    message_full = await asyncio.to_thread(
-        service.users()
-        .messages()
-        .get(
-            userId="me",
-            id=message_id,
-            format="full",  # Request full payload for body
-        )
-        .execute
-    )
-
     # Extract both text and HTML bodies using enhanced helper function
-    payload = message_full.get("payload", {})
     bodies = _extract_message_bodies(payload)
     text_body = bodies.get("text", "")
     html_body = bodies.get("html", "")
@@ -635,6 +780,30 @@ async def get_gmail_message_content(
     return "\n".join(content_lines)
 
 
+def _format_batch_message(
+    mid: str, headers: Dict[str, str], body_data: Optional[str]
+) -> str:
+    """Render one message of get_gmail_messages_content_batch output."""
+    parts = [
+        f"Message ID: {mid}\nSubject: {headers.get('Subject', '(no subject)')}\n"
+        f"From: {headers.get('From', '(unknown sender)')}\n"
+        f"Date: {headers.get('Date', '(unknown date)')}\n"
+    ]
+    rfc822_msg_id = headers.get("Message-ID", "")
+    if rfc822_msg_id:
+        parts.append(f"Message-ID: {rfc822_msg_id}\n")
+    to = headers.get("To", "")
+    if to:
+        parts.append(f"To: {to}\n")
+    cc = headers.get("Cc", "")
+    if cc:
+        parts.append(f"Cc: {cc}\n")
+    parts.append(f"Web Link: {_generate_gmail_web_url(mid)}\n")
+    if body_data is not None:
+        parts.append(f"\n{body_data}\n")
+    return "".join(parts)
+
+
 @server.tool()
 @handle_http_errors(
     "get_gmail_messages_content_batch", is_read_only=True, service_type="gmail"
@@ -667,6 +836,13 @@ async def get_gmail_messages_content_batch(
 
     output_messages = []
 
+    # Request parameters are the same for every message, so select them once
+    # Resource objects are rebuilt on every attribute chain; bind get() once
+    messages_get = service.users().messages().get
+    get_params: Dict[str, Any] = {"userId": "me", "format": format}
+    if format == "metadata":
+        get_params["metadataHeaders"] = GMAIL_METADATA_HEADERS
+
     # Process in smaller chunks to prevent SSL connection exhaustion
     for chunk_start in range(0, len(message_ids), GMAIL_BATCH_SIZE):
         chunk_ids = message_ids[chunk_start : chunk_start + GMAIL_BATCH_SIZE]
@@ -681,80 +857,41 @@ async def get_gmail_messages_content_batch(
             batch = service.new_batch_http_request(callback=_batch_callback)
 
             for mid in chunk_ids:
-                if format == "metadata":
-                    req = (
-                        service.users()
-                        .messages()
-                        .get(
-                            userId="me",
-                            id=mid,
-                            format="metadata",
-                            metadataHeaders=GMAIL_METADATA_HEADERS,
-                        )
-                    )
-                else:
-                    req = (
-                        service.users()
-                        .messages()
-                        .get(userId="me", id=mid, format="full")
-                    )
-                batch.add(req, request_id=mid)
+                batch.add(messages_get(id=mid, **get_params), request_id=mid)
 
             # Execute batch request
             await asyncio.to_thread(batch.execute)
 
         except Exception as batch_error:
-            # Fallback to sequential processing instead of parallel to prevent SSL exhaustion
+            # Fallback to individual requests, with only a few in flight to prevent SSL exhaustion
             logger.warning(
-                f"[get_gmail_messages_content_batch] Batch API failed, falling back to sequential processing: {batch_error}"
+                f"[get_gmail_messages_content_batch] Batch API failed, falling back to individual requests: {batch_error}"
             )
 
-            async def fetch_message_with_retry(mid: str, max_retries: int = 3):
-                """Fetch a single message with exponential backoff retry for SSL errors"""
-                for attempt in range(max_retries):
-                    try:
-                        if format == "metadata":
-                            msg = await asyncio.to_thread(
-                                service.users()
-                                .messages()
-                                .get(
-                                    userId="me",
-                                    id=mid,
-                                    format="metadata",
-                                    metadataHeaders=GMAIL_METADATA_HEADERS,
-                                )
-                                .execute
-                            )
-                        else:
-                            msg = await asyncio.to_thread(
-                                service.users()
-                                .messages()
-                                .get(userId="me", id=mid, format="full")
-                                .execute
-                            )
-                        return mid, msg, None
-                    except ssl.SSLError as ssl_error:
-                        if attempt < max_retries - 1:
-                            # Exponential backoff: 1s, 2s, 4s
-                            delay = 2**attempt
-                            logger.warning(
-                                f"[get_gmail_messages_content_batch] SSL error for message {mid} on attempt {attempt + 1}: {ssl_error}. Retrying in {delay}s..."
-                            )
-                            await asyncio.sleep(delay)
-                        else:
-                            logger.error(
-                                f"[get_gmail_messages_content_batch] SSL error for message {mid} on final attempt: {ssl_error}"
-                            )
-                            return mid, None, ssl_error
-                    except Exception as e:
-                        return mid, None, e
-
-            # Process messages sequentially with small delays to prevent connection exhaustion
-            for mid in chunk_ids:
-                mid_result, msg_data, error = await fetch_message_with_retry(mid)
+            async def fetch_message_with_retry(mid: str, http):
+                """Fetch a single message, retrying transient failures"""
+                try:
+                    msg = await _execute_with_retry(
+                        messages_get(id=mid, **get_params),
+                        http,
+                        "get_gmail_messages_content_batch",
+                        f"message {mid}",
+                    )
+                    return mid, msg, None
+                except Exception as e:
+                    return mid, None, e
+
+            http_pool = _HttpPool(service, GMAIL_MAX_CONCURRENT_REQUESTS)
+
+            async def fetch_bounded(mid: str):
+                async with http_pool.borrow() as http:
+                    return await fetch_message_with_retry(mid, http)
+
+            fetched_messages = await asyncio.gather(
+                *(fetch_bounded(mid) for mid in chunk_ids)
+            )
+            for mid_result, msg_data, error in fetched_messages:
                 results[mid_result] = {"data": msg_data, "error": error}
-                # Brief delay between requests to allow connection cleanup
-                await asyncio.sleep(GMAIL_REQUEST_DELAY)
 
         # Process results for this chunk
         for mid in chunk_ids:
@@ -768,64 +905,20 @@ async def get_gmail_messages_content_batch(
                     output_messages.append(f"⚠️ Message {mid}: No data returned\n")
                     continue
 
-                # Extract content based on format
                 payload = message.get("payload", {})
-
+                headers = _extract_headers(payload, GMAIL_METADATA_HEADERS)
                 if format == "metadata":
-                    headers = _extract_headers(payload, GMAIL_METADATA_HEADERS)
-                    subject = headers.get("Subject", "(no subject)")
-                    sender = headers.get("From", "(unknown sender)")
-                    to = headers.get("To", "")
-                    cc = headers.get("Cc", "")
-                    rfc822_msg_id = headers.get("Message-ID", "")
-
-                    msg_output = (
-                        f"Message ID: {mid}\nSubject: {subject}\nFrom: {sender}\n"
-                        f"Date: {headers.get('Date', '(unknown date)')}\n"
-                    )
-                    if rfc822_msg_id:
-                        msg_output += f"Message-ID: {rfc822_msg_id}\n"
-
-                    if to:
-                        msg_output += f"To: {to}\n"
-                    if cc:
-                        msg_output += f"Cc: {cc}\n"
-                    msg_output += f"Web Link: {_generate_gmail_web_url(mid)}\n"
-
-                    output_messages.append(msg_output)
+                    body_data = None
                 else:
-                    # Full format - extract body too
-                    headers = _extract_headers(payload, GMAIL_METADATA_HEADERS)
-                    subject = headers.get("Subject", "(no subject)")
-                    sender = headers.get("From", "(unknown sender)")
-                    to = headers.get("To", "")
-                    cc = headers.get("Cc", "")
-                    rfc822_msg_id = headers.get("Message-ID", "")
-
-                    # Extract both text and HTML bodies using enhanced helper function
+                    # Full format - extract both text and HTML bodies and
+                    # format them with HTML fallback
                     bodies = _extract_message_bodies(payload)
-                    text_body = bodies.get("text", "")
-                    html_body = bodies.get("html", "")
-
-                    # Format body content with HTML fallback
-                    body_data = _format_body_content(text_body, html_body)
-
-                    msg_output = (
-                        f"Message ID: {mid}\nSubject: {subject}\nFrom: {sender}\n"
-                        f"Date: {headers.get('Date', '(unknown date)')}\n"
-                    )
-                    if rfc822_msg_id:
-                        msg_output += f"Message-ID: {rfc822_msg_id}\n"
-
-                    if to:
-                        msg_output += f"To: {to}\n"
-                    if cc:
-                        msg_output += f"Cc: {cc}\n"
-                    msg_output += (
-                        f"Web Link: {_generate_gmail_web_url(mid)}\n\n{body_data}\n"
+                    body_data = _format_body_content(
+                        bodies.get("text", ""), bodies.get("html", "")
                     )
-
-                    output_messages.append(msg_output)
+                output_messages.append(
+                    _format_batch_message(mid, headers, body_data)
+                )
 
     # Combine all messages with separators
     final_output = f"Retrieved {len(message_ids)} messages:\n\n"
@@ -834,6 +927,49 @@ async def get_gmail_messages_content_batch(
     return final_output
 
 
+# Recently fetched attachment metadata, keyed by (user_google_email, message_id),
+# so downloading several attachments of one message costs one metadata request
+ATTACHMENT_METADATA_TTL_SECONDS = 60
+_ATTACHMENT_METADATA_CACHE_MAX = 256
+_attachment_metadata_cache: "OrderedDict[Tuple[str, str], Tuple[float, List[Dict[str, Any]]]]" = (
+    OrderedDict()
+)
+
+
+async def _get_message_attachments(
+    service, user_google_email: str, message_id: str
+) -> List[Dict[str, Any]]:
+    """Return attachment metadata for a message, reusing a recent lookup."""
+    key = (user_google_email, message_id)
+    cached = _attachment_metadata_cache.get(key)
+    if cached is not None and cached[0] > time.monotonic():
+        _attachment_metadata_cache.move_to_end(key)
+        return cached[1]
+
+    # Use format="full" with fields to limit response to attachment metadata only
+    message_full = await asyncio.to_thread(
+        service.users()
+        .messages()
+        .get(
+            userId="me",
+            id=message_id,
+            format="full",
+            fields="payload(parts(filename,mimeType,body(attachmentId,size)),body(attachmentId,size),filename,mimeType)",
+        )
+        .execute
+    )
+    attachments = _extract_attachments(message_full.get("payload", {}))
+
+    _attachment_metadata_cache[key] = (
+        time.monotonic() + ATTACHMENT_METADATA_TTL_SECONDS,
+        attachments,
+    )
+    _attachment_metadata_cache.move_to_end(key)
+    if len(_attachment_metadata_cache) > _ATTACHMENT_METADATA_CACHE_MAX:
+        _attachment_metadata_cache.popitem(last=False)
+    return attachments
+
+
 @server.tool()
 @handle_http_errors(
     "get_gmail_attachment_content", is_read_only=True, service_type="gmail"
@@ -918,20 +1054,9 @@ async def get_gmail_attachment_content(
         filename = None
         mime_type = None
         try:
-            # Use format="full" with fields to limit response to attachment metadata only
-            message_full = await asyncio.to_thread(
-                service.users()
-                .messages()
-                .get(
-                    userId="me",
-                    id=message_id,
-                    format="full",
-                    fields="payload(parts(filename,mimeType,body(attachmentId,size)),body(attachmentId,size),filename,mimeType)",
-                )
-                .execute
+            attachments = await _get_message_attachments(
+                service, user_google_email, message_id
             )
-            payload = message_full.get("payload", {})
-            attachments = _extract_attachments(payload)
 
             # First try exact attachmentId match
             for att in attachments:
@@ -1391,44 +1516,31 @@ async def draft_gmail_message(
     return f"Draft created{attachment_info}! Draft ID: {draft_id}"
 
 
-def _format_thread_content(thread_data: dict, thread_id: str) -> str:
-    """
-    Helper function to format thread content from Gmail API response.
-
-    Args:
-        thread_data (dict): Thread data from Gmail API
-        thread_id (str): Thread ID for display
-
-    Returns:
-        str: Formatted thread content
-    """
+def _iter_thread_lines(
+    thread_data: dict, thread_id: str, include_bodies: bool = True
+) -> Iterator[str]:
+    """Yield the formatted lines of a thread from a Gmail API response."""
     messages = thread_data.get("messages", [])
     if not messages:
-        return f"No messages found in thread '{thread_id}'."
+        yield f"No messages found in thread '{thread_id}'."
+        return
+
+    # Extract only the rendered headers, once per message
+    message_headers = [
+        _extract_headers(message.get("payload", {}), _THREAD_MESSAGE_HEADERS)
+        for message in messages
+    ]
 
     # Extract thread subject from the first message
-    first_message = messages[0]
-    first_headers = {
-        h["name"]: h["value"]
-        for h in first_message.get("payload", {}).get("headers", [])
-    }
-    thread_subject = first_headers.get("Subject", "(no subject)")
+    thread_subject = message_headers[0].get("Subject", "(no subject)")
 
-    # Build the thread content
-    content_lines = [
-        f"Thread ID: {thread_id}",
-        f"Subject: {thread_subject}",
-        f"Messages: {len(messages)}",
-        "",
-    ]
+    yield f"Thread ID: {thread_id}"
+    yield f"Subject: {thread_subject}"
+    yield f"Messages: {len(messages)}"
+    yield ""
 
     # Process each message in the thread
-    for i, message in enumerate(messages, 1):
-        # Extract headers
-        headers = {
-            h["name"]: h["value"] for h in message.get("payload", {}).get("headers", [])
-        }
-
+    for i, (message, headers) in enumerate(zip(messages, message_headers), 1):
         sender = headers.get("From", "(unknown sender)")
         date = headers.get("Date", "(unknown date)")
         subject = headers.get("Subject", "(no subject)")
@@ -1436,51 +1548,68 @@ def _format_thread_content(thread_data: dict, thread_id: str) -> str:
         in_reply_to = headers.get("In-Reply-To", "")
         references = headers.get("References", "")
 
-        # Extract both text and HTML bodies
-        payload = message.get("payload", {})
-        bodies = _extract_message_bodies(payload)
-        text_body = bodies.get("text", "")
-        html_body = bodies.get("html", "")
-
-        # Format body content with HTML fallback
-        body_data = _format_body_content(text_body, html_body)
-
-        # Add message to content
-        content_lines.extend(
-            [
-                f"=== Message {i} ===",
-                f"From: {sender}",
-                f"Date: {date}",
-            ]
-        )
+        yield f"=== Message {i} ==="
+        yield f"From: {sender}"
+        yield f"Date: {date}"
 
         if rfc822_message_id:
-            content_lines.append(f"Message-ID: {rfc822_message_id}")
+            yield f"Message-ID: {rfc822_message_id}"
         if in_reply_to:
-            content_lines.append(f"In-Reply-To: {in_reply_to}")
+            yield f"In-Reply-To: {in_reply_to}"
         if references:
-            content_lines.append(f"References: {references}")
+            yield f"References: {references}"
 
         # Only show subject if it's different from thread subject
         if subject != thread_subject:
-            content_lines.append(f"Subject: {subject}")
+            yield f"Subject: {subject}"
 
-        content_lines.extend(
-            [
-                "",
-                body_data,
-                "",
-            ]
-        )
+        yield ""
+        if not include_bodies:
+            continue
 
-    return "\n".join(content_lines)
+        # Extract both text and HTML bodies
+        bodies = _extract_message_bodies(message.get("payload", {}))
+        text_body = bodies.get("text", "")
+        html_body = bodies.get("html", "")
+
+        # Format body content with HTML fallback
+        yield _format_body_content(text_body, html_body)
+        yield ""
+
+
+def _format_thread_content(
+    thread_data: dict, thread_id: str, include_bodies: bool = True
+) -> str:
+    """
+    Helper function to format thread content from Gmail API response.
+
+    Args:
+        thread_data (dict): Thread data from Gmail API
+        thread_id (str): Thread ID for display
+        include_bodies (bool): Whether to render message bodies
+
+    Returns:
+        str: Formatted thread content
+    """
+    return "\n".join(_iter_thread_lines(thread_data, thread_id, include_bodies))
+
+
+def _thread_get_params(format: str) -> Dict[str, Any]:
+    """Build the threads().get parameters shared by every thread request."""
+    get_params: Dict[str, Any] = {"userId": "me", "format": format}
+    if format == "metadata":
+        get_params["metadataHeaders"] = _THREAD_MESSAGE_HEADERS
+    return get_params
 
 
 @server.tool()
 @require_google_service("gmail", "gmail_read")
 @handle_http_errors("get_gmail_thread_content", is_read_only=True, service_type="gmail")
 async def get_gmail_thread_content(
-    service, thread_id: str, user_google_email: str
+    service,
+    thread_id: str,
+    user_google_email: str,
+    format: Literal["full", "metadata"] = "full",
 ) -> str:
     """
     Retrieves the complete content of a Gmail conversation thread, including all messages.
@@ -1488,6 +1617,7 @@ async def get_gmail_thread_content(
     Args:
         thread_id (str): The unique ID of the Gmail thread to retrieve.
         user_google_email (str): The user's Google email address. Required.
+        format (Literal["full", "metadata"]): Thread format. "full" includes message bodies, "metadata" only headers.
 
     Returns:
         str: The complete thread content with all messages formatted for reading.
@@ -1498,10 +1628,15 @@ async def get_gmail_thread_content(
 
     # Fetch the complete thread with all messages
     thread_response = await asyncio.to_thread(
-        service.users().threads().get(userId="me", id=thread_id, format="full").execute
+        service.users()
+        .threads()
+        .get(id=thread_id, **_thread_get_params(format))
+        .execute
     )
 
-    return _format_thread_content(thread_response, thread_id)
+    return _format_thread_content(
+        thread_response, thread_id, include_bodies=format == "full"
+    )
 
 
 @server.tool()
@@ -1513,6 +1648,7 @@ async def get_gmail_threads_content_batch(
     service,
     thread_ids: List[str],
     user_google_email: str,
+    format: Literal["full", "metadata"] = "full",
 ) -> str:
     """
     Retrieves the content of multiple Gmail threads in a single batch request.
@@ -1521,6 +1657,7 @@ async def get_gmail_threads_content_batch(
     Args:
         thread_ids (List[str]): A list of Gmail thread IDs to retrieve. The function will automatically batch requests in chunks of 25.
         user_google_email (str): The user's Google email address. Required.
+        format (Literal["full", "metadata"]): Thread format. "full" includes message bodies, "metadata" only headers.
 
     Returns:
         str: A formatted list of thread contents with separators.
@@ -1532,85 +1669,103 @@ async def get_gmail_threads_content_batch(
     if not thread_ids:
         raise ValueError("No thread IDs provided")
 
-    output_threads = []
+    # Resource objects are rebuilt on every attribute chain; bind get() once
+    threads_get = service.users().threads().get
+    get_params = _thread_get_params(format)
+    include_bodies = format == "full"
+    # Chunk batches and fallback fetches share one bounded set of connections
+    http_pool = _HttpPool(service, GMAIL_MAX_CONCURRENT_REQUESTS)
 
-    def _batch_callback(request_id, response, exception):
-        """Callback for batch requests"""
-        results[request_id] = {"data": response, "error": exception}
+    async def fetch_thread_with_retry(tid: str):
+        """Fetch a single thread, retrying transient failures"""
+        async with http_pool.borrow() as http:
+            try:
+                thread = await _execute_with_retry(
+                    threads_get(id=tid, **get_params),
+                    http,
+                    "get_gmail_threads_content_batch",
+                    f"thread {tid}",
+                )
+                return tid, thread, None
+            except Exception as e:
+                return tid, None, e
 
-    # Process in smaller chunks to prevent SSL connection exhaustion
-    for chunk_start in range(0, len(thread_ids), GMAIL_BATCH_SIZE):
-        chunk_ids = thread_ids[chunk_start : chunk_start + GMAIL_BATCH_SIZE]
-        results: Dict[str, Dict] = {}
+    # One slot per requested thread, filled in place so input order is kept
+    # without a lookup table; duplicate IDs each get their own slot
+    results: List[Dict[str, Any]] = [
+        {"data": None, "error": "No result"} for _ in thread_ids
+    ]
 
-        # Try to use batch API
-        try:
-            batch = service.new_batch_http_request(callback=_batch_callback)
+    async def fetch_chunk(chunk_start: int) -> None:
+        """Fetch one chunk of threads into its slots of results."""
+        positions = range(chunk_start, min(chunk_start + GMAIL_BATCH_SIZE, len(thread_ids)))
 
-            for tid in chunk_ids:
-                req = service.users().threads().get(userId="me", id=tid, format="full")
-                batch.add(req, request_id=tid)
+        def _batch_callback(request_id, response, exception):
+            """Callback for batch requests"""
+            results[int(request_id)] = {"data": response, "error": exception}
 
-            # Execute batch request
-            await asyncio.to_thread(batch.execute)
+        # Try to use batch API
+        try:
+            async with http_pool.borrow() as http:
+                batch = service.new_batch_http_request(callback=_batch_callback)
+                for position in positions:
+                    req = threads_get(id=thread_ids[position], **get_params)
+                    batch.add(req, request_id=str(position))
+                await asyncio.to_thread(batch.execute, http=http)
+            # Rate-limited or failed parts of the batch are fetched individually
+            retry_positions = [
+                position
+                for position in positions
+                if _retry_delay(results[position]["error"], 0) is not None
+            ]
 
         except Exception as batch_error:
-            # Fallback to sequential processing instead of parallel to prevent SSL exhaustion
+            # Fallback to individual requests, with only a few in flight to prevent SSL exhaustion
             logger.warning(
-                f"[get_gmail_threads_content_batch] Batch API failed, falling back to sequential processing: {batch_error}"
+                f"[get_gmail_threads_content_batch] Batch API failed, falling back to individual requests: {batch_error}"
             )
+            retry_positions = positions
 
-            async def fetch_thread_with_retry(tid: str, max_retries: int = 3):
-                """Fetch a single thread with exponential backoff retry for SSL errors"""
-                for attempt in range(max_retries):
-                    try:
-                        thread = await asyncio.to_thread(
-                            service.users()
-                            .threads()
-                            .get(userId="me", id=tid, format="full")
-                            .execute
-                        )
-                        return tid, thread, None
-                    except ssl.SSLError as ssl_error:
-                        if attempt < max_retries - 1:
-                            # Exponential backoff: 1s, 2s, 4s
-                            delay = 2**attempt
-                            logger.warning(
-                                f"[get_gmail_threads_content_batch] SSL error for thread {tid} on attempt {attempt + 1}: {ssl_error}. Retrying in {delay}s..."
-                            )
-                            await asyncio.sleep(delay)
-                        else:
-                            logger.error(
-                                f"[get_gmail_threads_content_batch] SSL error for thread {tid} on final attempt: {ssl_error}"
-                            )
-                            return tid, None, ssl_error
-                    except Exception as e:
-                        return tid, None, e
-
-            # Process threads sequentially with small delays to prevent connection exhaustion
-            for tid in chunk_ids:
-                tid_result, thread_data, error = await fetch_thread_with_retry(tid)
-                results[tid_result] = {"data": thread_data, "error": error}
-                # Brief delay between requests to allow connection cleanup
-                await asyncio.sleep(GMAIL_REQUEST_DELAY)
-
-        # Process results for this chunk
-        for tid in chunk_ids:
-            entry = results.get(tid, {"data": None, "error": "No result"})
-
+        fetched_threads = await asyncio.gather(
+            *(fetch_thread_with_retry(thread_ids[position]) for position in retry_positions)
+        )
+        for position, (_, thread_data, error) in zip(retry_positions, fetched_threads):
+            results[position] = {"data": thread_data, "error": error}
+
+    def iter_output_lines() -> Iterator[str]:
+        """Yield every output line so the response is joined exactly once."""
+        yield f"Retrieved {len(thread_ids)} threads:"
+        yield ""
+        for index, (tid, entry) in enumerate(zip(thread_ids, results)):
+            if index:
+                # Separator between threads
+                yield "---"
+                yield ""
             if entry["error"]:
-                output_threads.append(f"⚠️ Thread {tid}: {entry['error']}\n")
+                yield f"⚠️ Thread {tid}: {entry['error']}"
+                yield ""
+            elif not entry["data"]:
+                yield f"⚠️ Thread {tid}: No data returned"
+                yield ""
             else:
-                thread = entry["data"]
-                if not thread:
-                    output_threads.append(f"⚠️ Thread {tid}: No data returned\n")
-                    continue
-
-                output_threads.append(_format_thread_content(thread, tid))
+                yield from _iter_thread_lines(entry["data"], tid, include_bodies)
+
+    # Chunks of GMAIL_BATCH_SIZE keep each batch small enough to avoid SSL
+    # exhaustion; the chunks themselves run concurrently
+    await asyncio.gather(
+        *(
+            fetch_chunk(chunk_start)
+            for chunk_start in range(0, len(thread_ids), GMAIL_BATCH_SIZE)
+        )
+    )
 
-    # Combine all threads with separators
-    header = f"Retrieved {len(thread_ids)} threads:"
-    return header + "\n\n" + "\n---\n\n".join(output_threads)
+    if len(thread_ids) < GMAIL_THREAD_FORMAT_OFFLOAD_MIN:
+        return "\n".join(iter_output_lines())
+    # Decoding and HTML stripping for large batches would otherwise block
+    # other tool calls for the whole formatting pass
+    return await asyncio.to_thread(
+        lambda: "\n".join(iter_output_lines())
+    )
 
 
 @server.tool()
@@ -1638,25 +1793,22 @@ async def list_gmail_labels(service, user_google_email: str) -> str:
 
     lines = [f"Found {len(labels)} labels:", ""]
 
-    system_labels = []
-    user_labels = []
-
+    # Render each label while partitioning, in a single pass
+    system_lines = []
+    user_lines = []
     for label in labels:
-        if label.get("type") == "system":
-            system_labels.append(label)
-        else:
-            user_labels.append(label)
+        (system_lines if label.get("type") == "system" else user_lines).append(
+            f"  • {label['name']} (ID: {label['id']})"
+        )
 
-    if system_labels:
+    if system_lines:
         lines.append("📂 SYSTEM LABELS:")
-        for label in system_labels:
-            lines.append(f"  • {label['name']} (ID: {label['id']})")
+        lines.extend(system_lines)
         lines.append("")
 
-    if user_labels:
+    if user_lines:
         lines.append("🏷️  USER LABELS:")
-        for label in user_labels:
-            lines.append(f"  • {label['name']} (ID: {label['id']})")
+        lines.extend(user_lines)
 
     return "\n".join(lines)
 
@@ -1709,37 +1861,64 @@ async def manage_gmail_label(
         return f"Label created successfully!\nName: {created_label['name']}\nID: {created_label['id']}"
 
     elif action == "update":
-        current_label = await asyncio.to_thread(
-            service.users().labels().get(userId="me", id=label_id).execute
-        )
-
+        # patch() leaves omitted fields unchanged, so the current name never
+        # needs to be fetched first
         label_object = {
-            "id": label_id,
-            "name": name if name is not None else current_label["name"],
             "labelListVisibility": label_list_visibility,
             "messageListVisibility": message_list_visibility,
         }
+        if name is not None:
+            label_object["name"] = name
 
         updated_label = await asyncio.to_thread(
             service.users()
             .labels()
-            .update(userId="me", id=label_id, body=label_object)
+            .patch(userId="me", id=label_id, body=label_object)
             .execute
         )
         return f"Label updated successfully!\nName: {updated_label['name']}\nID: {updated_label['id']}"
 
     elif action == "delete":
+        labels_resource = service.users().labels()
         label = await asyncio.to_thread(
-            service.users().labels().get(userId="me", id=label_id).execute
+            labels_resource.get(userId="me", id=label_id).execute
         )
         label_name = label["name"]
 
         await asyncio.to_thread(
-            service.users().labels().delete(userId="me", id=label_id).execute
+            labels_resource.delete(userId="me", id=label_id).execute
         )
         return f"Label '{label_name}' (ID: {label_id}) deleted successfully!"
 
 
+# Filter fields rendered by list_gmail_filters, in display order; "size" is
+# rendered separately because it depends on "sizeComparison"
+_FILTER_CRITERIA_RENDERERS = (
+    ("from", "From: {}".format),
+    ("to", "To: {}".format),
+    ("subject", "Subject: {}".format),
+    ("query", "Query: {}".format),
+    ("negatedQuery", "Exclude Query: {}".format),
+    ("hasAttachment", lambda _: "Has attachment"),
+    ("excludeChats", lambda _: "Exclude chats"),
+)
+_FILTER_ACTION_RENDERERS = (
+    ("forward", "Forward to: {}".format),
+    ("removeLabelIds", lambda ids: f"Remove labels: {', '.join(ids)}"),
+    ("addLabelIds", lambda ids: f"Add labels: {', '.join(ids)}"),
+)
+
+
+def _render_filter_fields(fields: dict, renderers) -> List[str]:
+    """Render the set fields of a filter's criteria or action."""
+    lines = []
+    for key, render in renderers:
+        value = fields.get(key)
+        if value:
+            lines.append(render(value))
+    return lines
+
+
 @server.tool()
 @handle_http_errors("list_gmail_filters", is_read_only=True, service_type="gmail")
 @require_google_service("gmail", "gmail_settings_basic")
@@ -1774,21 +1953,7 @@ async def list_gmail_filters(service, user_google_email: str) -> str:
         lines.append(f"🔹 Filter ID: {filter_id}")
         lines.append("  Criteria:")
 
-        criteria_lines = []
-        if criteria.get("from"):
-            criteria_lines.append(f"From: {criteria['from']}")
-        if criteria.get("to"):
-            criteria_lines.append(f"To: {criteria['to']}")
-        if criteria.get("subject"):
-            criteria_lines.append(f"Subject: {criteria['subject']}")
-        if criteria.get("query"):
-            criteria_lines.append(f"Query: {criteria['query']}")
-        if criteria.get("negatedQuery"):
-            criteria_lines.append(f"Exclude Query: {criteria['negatedQuery']}")
-        if criteria.get("hasAttachment"):
-            criteria_lines.append("Has attachment")
-        if criteria.get("excludeChats"):
-            criteria_lines.append("Exclude chats")
+        criteria_lines = _render_filter_fields(criteria, _FILTER_CRITERIA_RENDERERS)
         if criteria.get("size"):
             comparison = criteria.get("sizeComparison", "")
             criteria_lines.append(
@@ -1801,13 +1966,7 @@ async def list_gmail_filters(service, user_google_email: str) -> str:
         lines.extend([f"    • {line}" for line in criteria_lines])
 
         lines.append("  Actions:")
-        action_lines = []
-        if action.get("forward"):
-            action_lines.append(f"Forward to: {action['forward']}")
-        if action.get("removeLabelIds"):
-            action_lines.append(f"Remove labels: {', '.join(action['removeLabelIds'])}")
-        if action.get("addLabelIds"):
-            action_lines.append(f"Add labels: {', '.join(action['addLabelIds'])}")
+        action_lines = _render_filter_fields(action, _FILTER_ACTION_RENDERERS)
 
         if not action_lines:
             action_lines.append("(none)")
@@ -1884,12 +2043,13 @@ async def delete_gmail_filter(
     """
     logger.info(f"[delete_gmail_filter] Invoked. Filter ID: '{filter_id}'")
 
+    filters_resource = service.users().settings().filters()
     filter_details = await asyncio.to_thread(
-        service.users().settings().filters().get(userId="me", id=filter_id).execute
+        filters_resource.get(userId="me", id=filter_id).execute
     )
 
     await asyncio.to_thread(
-        service.users().settings().filters().delete(userId="me", id=filter_id).execute
+        filters_resource.delete(userId="me", id=filter_id).execute
     )
 
     criteria = filter_details.get("criteria", {})
@@ -1903,6 +2063,95 @@ async def delete_gmail_filter(
     )
 
 
+# Single-message label changes arriving within this window share a request
+GMAIL_LABEL_MODIFY_WINDOW = 0.05
+GMAIL_BATCH_MODIFY_MAX_IDS = 1000
+
+
+class _LabelModifyCoalescer:
+    """
+    Merges concurrent single-message label changes into batchModify calls.
+
+    Calls for the same user with the same labels to add and remove that
+    arrive within the window are applied with one request, made with the
+    first caller's service. If that request fails, each message is modified
+    individually with its own caller's service so errors stay per message.
+    """
+
+    def __init__(self, window: float):
+        self._window = window
+        self._pending: Dict[tuple, List[tuple]] = {}
+        self._flushes: set = set()
+
+    async def modify(
+        self, service, user_google_email: str, message_id: str, body: Dict[str, Any]
+    ) -> None:
+        key = (
+            user_google_email,
+            frozenset(body.get("addLabelIds", ())),
+            frozenset(body.get("removeLabelIds", ())),
+        )
+        future = asyncio.get_running_loop().create_future()
+        entries = self._pending.get(key)
+        if entries is None:
+            entries = self._pending[key] = []
+            flush = asyncio.create_task(self._flush(key, body))
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+        entries.append((message_id, service, future))
+        # A cancelled caller must not cancel the request other callers share
+        await asyncio.shield(future)
+
+    async def _flush(self, key: tuple, body: Dict[str, Any]) -> None:
+        await asyncio.sleep(self._window)
+        entries = self._pending.pop(key)
+        if len(entries) == 1:
+            await self._modify_one(entries[0], body)
+            return
+
+        message_ids = list(dict.fromkeys(message_id for message_id, _, _ in entries))
+        messages_resource = entries[0][1].users().messages()
+        try:
+            for start in range(0, len(message_ids), GMAIL_BATCH_MODIFY_MAX_IDS):
+                batch_body = {
+                    **body,
+                    "ids": message_ids[start : start + GMAIL_BATCH_MODIFY_MAX_IDS],
+                }
+                await asyncio.to_thread(
+                    messages_resource.batchModify(userId="me", body=batch_body).execute
+                )
+        except Exception as e:
+            logger.warning(
+                f"[modify_gmail_message_labels] batchModify for {len(message_ids)} messages failed, modifying individually: {e}"
+            )
+            await asyncio.gather(*(self._modify_one(entry, body) for entry in entries))
+            return
+
+        for _, _, future in entries:
+            if not future.done():
+                future.set_result(None)
+
+    @staticmethod
+    async def _modify_one(entry: tuple, body: Dict[str, Any]) -> None:
+        message_id, service, future = entry
+        try:
+            await asyncio.to_thread(
+                service.users()
+                .messages()
+                .modify(userId="me", id=message_id, body=body)
+                .execute
+            )
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(None)
+
+
+_label_modify_coalescer = _LabelModifyCoalescer(GMAIL_LABEL_MODIFY_WINDOW)
+
+
 @server.tool()
 @handle_http_errors("modify_gmail_message_labels", service_type="gmail")
 @require_google_service("gmail", GMAIL_MODIFY_SCOPE)
@@ -1942,9 +2191,7 @@ async def modify_gmail_message_labels(
     if remove_label_ids:
         body["removeLabelIds"] = remove_label_ids
 
-    await asyncio.to_thread(
-        service.users().messages().modify(userId="me", id=message_id, body=body).execute
-    )
+    await _label_modify_coalescer.modify(service, user_google_email, message_id, body)
 
     actions = []
     if add_label_ids:
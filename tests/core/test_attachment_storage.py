@@ -0,0 +1,47 @@
+"""
+Unit tests for local attachment storage.
+"""
+
+import base64
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from core import attachment_storage
+from core.attachment_storage import AttachmentStorage
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(attachment_storage, "STORAGE_DIR", tmp_path)
+    return AttachmentStorage()
+
+
+def test_save_attachment_accepts_raw_bytes(storage):
+    """Raw bytes are written as-is without a base64 round trip."""
+    payload = b"\x00\x01binary payload"
+
+    result = storage.save_attachment(file_bytes=payload, filename="data.bin")
+
+    with open(result.path, "rb") as f:
+        assert f.read() == payload
+    assert storage.get_attachment_metadata(result.file_id)["size"] == len(payload)
+
+
+def test_save_attachment_decodes_base64(storage):
+    """The base64 path still decodes before writing."""
+    payload = b"hello attachment"
+    encoded = base64.urlsafe_b64encode(payload).decode("ascii")
+
+    result = storage.save_attachment(base64_data=encoded, filename="hello.txt")
+
+    with open(result.path, "rb") as f:
+        assert f.read() == payload
+
+
+def test_save_attachment_requires_data(storage):
+    with pytest.raises(ValueError):
+        storage.save_attachment(filename="empty.txt")
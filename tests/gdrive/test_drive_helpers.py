@@ -0,0 +1,210 @@
+"""
+Unit tests for Google Drive helper functions.
+"""
+
+import os
+import sys
+
+import pytest
+from unittest.mock import Mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from gdrive import drive_helpers
+from gdrive.drive_helpers import (
+    DRIVE_QUERY_COMBINED,
+    DRIVE_QUERY_PATTERNS,
+    FOLDER_MIME_TYPE,
+    SHORTCUT_MIME_TYPE,
+    escape_drive_query_value,
+    format_permission_info,
+    resolve_drive_item,
+    resolve_folder_ids,
+)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "name = 'report.pdf'",
+        "modifiedTime > '2024-01-01T00:00:00'",
+        "'abc123' in parents",
+        "fullText contains 'budget'",
+        "mimeType != 'application/vnd.google-apps.folder'",
+        "TRASHED = false",
+        "quarterly budget",
+        "meeting notes 2024",
+        "",
+    ],
+)
+def test_combined_query_pattern_matches_individual_patterns(query):
+    """The combined alternation must agree with the per-pattern scan."""
+    expected = any(pattern.search(query) for pattern in DRIVE_QUERY_PATTERNS)
+    assert (DRIVE_QUERY_COMBINED.search(query) is not None) == expected
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("plain name", "plain name"),
+        ("Bob's file", "Bob\\'s file"),
+        ("C:\\temp", "C:\\\\temp"),
+        ("it\\'s", "it\\\\\\'s"),
+    ],
+)
+def test_escape_drive_query_value(value, expected):
+    assert escape_drive_query_value(value) == expected
+
+
+def _mock_service(*responses):
+    service = Mock()
+    service.files.return_value.get.return_value.execute.side_effect = list(responses)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_resolve_drive_item_skips_fetch_for_known_non_shortcut():
+    """A second resolution of a plain item should not hit the API."""
+    drive_helpers._resolved_item_mime_types.clear()
+    service = _mock_service({"id": "folder1", "mimeType": FOLDER_MIME_TYPE})
+
+    first = await resolve_drive_item(service, "folder1")
+    second = await resolve_drive_item(service, "folder1")
+
+    assert first[0] == second[0] == "folder1"
+    assert second[1]["mimeType"] == FOLDER_MIME_TYPE
+    assert service.files.return_value.get.return_value.execute.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_resolve_drive_item_fetches_when_extra_fields_requested():
+    """Cached entries only carry mimeType, so extra_fields still trigger a fetch."""
+    drive_helpers._resolved_item_mime_types.clear()
+    service = _mock_service(
+        {"id": "doc1", "mimeType": "text/plain"},
+        {"id": "doc1", "mimeType": "text/plain", "name": "notes.txt"},
+    )
+
+    await resolve_drive_item(service, "doc1")
+    _, metadata = await resolve_drive_item(service, "doc1", extra_fields="name")
+
+    assert metadata["name"] == "notes.txt"
+
+
+@pytest.mark.asyncio
+async def test_resolve_drive_item_does_not_cache_shortcuts():
+    """Shortcuts are always re-resolved; only the target is cached."""
+    drive_helpers._resolved_item_mime_types.clear()
+    service = _mock_service(
+        {
+            "id": "short1",
+            "mimeType": SHORTCUT_MIME_TYPE,
+            "shortcutDetails": {"targetId": "target1"},
+        },
+        {"id": "target1", "mimeType": "text/plain"},
+    )
+
+    resolved_id, _ = await resolve_drive_item(service, "short1")
+
+    assert resolved_id == "target1"
+    assert "short1" not in drive_helpers._resolved_item_mime_types
+    assert "target1" in drive_helpers._resolved_item_mime_types
+
+
+@pytest.mark.parametrize(
+    "permission, expected",
+    [
+        (
+            {"type": "anyone", "role": "reader", "id": "p1"},
+            "Anyone with the link (reader) [id: p1]",
+        ),
+        (
+            {"type": "user", "role": "writer", "emailAddress": "a@x.com", "id": "p2"},
+            "User: a@x.com (writer) [id: p2]",
+        ),
+        (
+            {"type": "group", "role": "commenter", "id": "p3"},
+            "Group: unknown (commenter) [id: p3]",
+        ),
+        (
+            {"type": "domain", "role": "reader", "domain": "x.com", "id": "p4"},
+            "Domain: x.com (reader) [id: p4]",
+        ),
+        ({"type": "custom", "role": "owner", "id": "p5"}, "custom (owner) [id: p5]"),
+        ({}, "unknown (unknown) [id: ]"),
+    ],
+)
+def test_format_permission_info_by_type(permission, expected):
+    assert format_permission_info(permission) == expected
+
+
+class _FakeBatch:
+    """Minimal stand-in for googleapiclient's BatchHttpRequest."""
+
+    def __init__(self, callback, responses):
+        self._callback = callback
+        self._responses = responses
+        self.request_ids = []
+
+    def add(self, request, request_id):
+        self.request_ids.append(request_id)
+
+    def execute(self):
+        for request_id in self.request_ids:
+            self._callback(request_id, self._responses[request_id], None)
+
+
+@pytest.mark.asyncio
+async def test_resolve_folder_ids_uses_one_batch_for_unknown_ids():
+    """Several unknown folders are fetched in one batch and returned in order."""
+    drive_helpers._resolved_item_mime_types.clear()
+    responses = {
+        fid: {"id": fid, "mimeType": FOLDER_MIME_TYPE} for fid in ("f1", "f2", "f3")
+    }
+    batches = []
+    service = Mock()
+
+    def _new_batch(callback):
+        batch = _FakeBatch(callback, responses)
+        batches.append(batch)
+        return batch
+
+    service.new_batch_http_request.side_effect = _new_batch
+
+    resolved = await resolve_folder_ids(service, ["f2", "f1", "f3", "f1"])
+
+    assert resolved == ["f2", "f1", "f3", "f1"]
+    assert len(batches) == 1
+    assert batches[0].request_ids == ["f2", "f1", "f3"]
+    service.files.return_value.get.return_value.execute.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_resolve_folder_ids_rejects_non_folders():
+    drive_helpers._resolved_item_mime_types.clear()
+    responses = {
+        "f1": {"id": "f1", "mimeType": FOLDER_MIME_TYPE},
+        "doc": {"id": "doc", "mimeType": "text/plain"},
+    }
+    service = Mock()
+    service.new_batch_http_request.side_effect = lambda callback: _FakeBatch(
+        callback, responses
+    )
+
+    with pytest.raises(Exception, match="is not a folder"):
+        await resolve_folder_ids(service, ["f1", "doc"])
+
+
+@pytest.mark.asyncio
+async def test_forget_resolved_item_forces_refetch():
+    drive_helpers._resolved_item_mime_types.clear()
+    service = _mock_service(
+        {"id": "folder1", "mimeType": FOLDER_MIME_TYPE},
+        {"id": "folder1", "mimeType": FOLDER_MIME_TYPE},
+    )
+
+    await resolve_drive_item(service, "folder1")
+    drive_helpers.forget_resolved_item("folder1")
+    await resolve_drive_item(service, "folder1")
+
+    assert service.files.return_value.get.return_value.execute.call_count == 2
@@ -44,3 +44,237 @@ async def test_create_drive_folder():
     assert "folder123" in result
     assert "user@example.com" in result
     assert "https://drive.google.com/drive/folders/folder123" in result
+
+
+def test_decode_text_content_skips_binary_mime_types():
+    """Binary MIME families are never decoded, even if the bytes are valid UTF-8."""
+    from gdrive.drive_tools import _decode_text_content
+
+    assert _decode_text_content(b"%PDF-1.7 plain ascii", "application/pdf") is None
+    assert _decode_text_content(b"ascii", "image/png") is None
+
+
+def test_decode_text_content_sniffs_unknown_types():
+    """Unknown types decode unless the leading block contains NUL bytes."""
+    from gdrive.drive_tools import _decode_text_content
+
+    assert _decode_text_content(b"hello", "application/x-custom") == "hello"
+    assert _decode_text_content(b"he\x00llo", "application/x-custom") is None
+    assert _decode_text_content("héllo".encode("utf-8"), "text/plain") == "héllo"
+    assert _decode_text_content(b"\xff\xfe", "text/plain") is None
+
+
+def test_chunk_size_from_env_rounds_to_drive_granularity(monkeypatch):
+    """Chunk size overrides are rounded down to 256 KB multiples."""
+    from gdrive.drive_tools import _chunk_size_from_env
+
+    monkeypatch.setenv("GDRIVE_TEST_CHUNK_MB", "1.1")
+    assert _chunk_size_from_env("GDRIVE_TEST_CHUNK_MB", 123) == 1024 * 1024
+
+    monkeypatch.setenv("GDRIVE_TEST_CHUNK_MB", "0")
+    assert _chunk_size_from_env("GDRIVE_TEST_CHUNK_MB", 123) == 256 * 1024
+
+    monkeypatch.setenv("GDRIVE_TEST_CHUNK_MB", "lots")
+    assert _chunk_size_from_env("GDRIVE_TEST_CHUNK_MB", 123) == 123
+
+    monkeypatch.delenv("GDRIVE_TEST_CHUNK_MB")
+    assert _chunk_size_from_env("GDRIVE_TEST_CHUNK_MB", 123) == 123
+
+
+def _unwrap(tool):
+    """Return the undecorated coroutine behind an MCP tool."""
+    fn = getattr(tool, "fn", tool)
+    while hasattr(fn, "__wrapped__"):
+        fn = fn.__wrapped__
+    return fn
+
+
+@pytest.mark.asyncio
+async def test_check_public_access_uses_single_list_call():
+    """Sharing state comes from the search response; no follow-up get is issued."""
+    from gdrive.drive_tools import check_drive_file_public_access
+
+    mock_service = Mock()
+    mock_service.files.return_value.list.return_value.execute.return_value = {
+        "files": [
+            {
+                "id": "img1",
+                "name": "logo.png",
+                "mimeType": "image/png",
+                "shared": True,
+                "permissions": [{"type": "anyone", "role": "reader"}],
+            }
+        ]
+    }
+
+    result = await _unwrap(check_drive_file_public_access)(
+        service=mock_service,
+        user_google_email="user@example.com",
+        file_name="logo.png",
+    )
+
+    assert "PUBLIC ACCESS ENABLED" in result
+    assert "id=img1" in result
+    mock_service.files.return_value.get.assert_not_called()
+    list_kwargs = mock_service.files.return_value.list.call_args.kwargs
+    assert list_kwargs["pageSize"] == 2
+    assert "Found multiple files" not in result
+
+
+@pytest.mark.asyncio
+async def test_check_public_access_resolves_shortcuts():
+    """Shortcuts fall back to fetching the target's permissions."""
+    from gdrive.drive_helpers import SHORTCUT_MIME_TYPE
+    from gdrive.drive_tools import check_drive_file_public_access
+
+    mock_service = Mock()
+    mock_service.files.return_value.list.return_value.execute.return_value = {
+        "files": [{"id": "short1", "name": "logo", "mimeType": SHORTCUT_MIME_TYPE}]
+    }
+    mock_service.files.return_value.get.return_value.execute.return_value = {
+        "name": "logo.png",
+        "mimeType": "image/png",
+        "permissions": [],
+    }
+
+    with patch(
+        "gdrive.drive_tools.resolve_drive_item",
+        new_callable=AsyncMock,
+        return_value=("target1", {}),
+    ):
+        result = await _unwrap(check_drive_file_public_access)(
+            service=mock_service,
+            user_google_email="user@example.com",
+            file_name="logo",
+        )
+
+    assert "ID: target1" in result
+    assert "NO PUBLIC ACCESS" in result
+
+
+@pytest.mark.asyncio
+async def test_update_drive_file_reports_only_real_changes():
+    """Only fields whose value actually changes show up in the report."""
+    from gdrive.drive_tools import update_drive_file
+
+    current_file = {
+        "name": "Report",
+        "description": "",
+        "starred": False,
+        "webViewLink": "https://drive.google.com/file/d/file1/view",
+    }
+    mock_service = Mock()
+    mock_service.files.return_value.update.return_value.execute.return_value = {
+        "name": "Report",
+        "webViewLink": current_file["webViewLink"],
+    }
+
+    with patch(
+        "gdrive.drive_tools.resolve_drive_item",
+        new_callable=AsyncMock,
+        return_value=("file1", current_file),
+    ):
+        result = await _unwrap(update_drive_file)(
+            service=mock_service,
+            user_google_email="user@example.com",
+            file_id="file1",
+            name="Report",
+            description="Quarterly numbers",
+            starred=True,
+        )
+
+    assert "Description: (empty) → Quarterly numbers" in result
+    assert "File starred" in result
+    assert "Name:" not in result
+
+
+@pytest.mark.asyncio
+async def test_update_drive_file_skips_api_call_without_changes():
+    """A call with no fields or parents to change never reaches files().update."""
+    from gdrive.drive_tools import update_drive_file
+
+    current_file = {
+        "name": "Report",
+        "webViewLink": "https://drive.google.com/file/d/file1/view",
+    }
+    mock_service = Mock()
+
+    with patch(
+        "gdrive.drive_tools.resolve_drive_item",
+        new_callable=AsyncMock,
+        return_value=("file1", current_file),
+    ):
+        result = await _unwrap(update_drive_file)(
+            service=mock_service,
+            user_google_email="user@example.com",
+            file_id="file1",
+        )
+
+    mock_service.files.return_value.update.assert_not_called()
+    assert "(No changes were made)" in result
+    assert current_file["webViewLink"] in result
+
+
+@pytest.mark.asyncio
+async def test_get_drive_file_permissions_detects_public_link_while_rendering():
+    from gdrive import drive_tools
+    from gdrive.drive_tools import get_drive_file_permissions
+
+    drive_tools._file_permissions_cache.clear()
+    mock_service = Mock()
+    mock_service.files.return_value.get.return_value.execute.return_value = {
+        "name": "logo.png",
+        "mimeType": "image/png",
+        "permissions": [
+            {"id": "p1", "type": "user", "role": "owner", "emailAddress": "a@x.com"},
+            {"id": "p2", "type": "anyone", "role": "reader"},
+        ],
+    }
+
+    with patch(
+        "gdrive.drive_tools.resolve_drive_item",
+        new_callable=AsyncMock,
+        return_value=("img1", {}),
+    ):
+        result = await _unwrap(get_drive_file_permissions)(
+            service=mock_service,
+            user_google_email="user@example.com",
+            file_id="img1",
+        )
+
+    assert "    - User: a@x.com (owner) [id: p1]" in result
+    assert "    - Anyone with the link (reader) [id: p2]" in result
+    assert "✅ This file is shared with 'Anyone with the link'" in result
+
+
+@pytest.mark.asyncio
+async def test_get_drive_file_permissions_caches_until_file_changes():
+    """Repeat lookups are served from cache until a sharing change for the file."""
+    from gdrive import drive_tools
+
+    drive_tools._file_permissions_cache.clear()
+    mock_service = Mock()
+    mock_execute = mock_service.files.return_value.get.return_value.execute
+    mock_execute.return_value = {"name": "doc", "mimeType": "text/plain"}
+
+    with patch(
+        "gdrive.drive_tools.resolve_drive_item",
+        new_callable=AsyncMock,
+        return_value=("doc1", {}),
+    ):
+        for _ in range(2):
+            await _unwrap(drive_tools.get_drive_file_permissions)(
+                service=mock_service,
+                user_google_email="user@example.com",
+                file_id="doc1",
+            )
+        assert mock_execute.call_count == 1
+
+        drive_tools._forget_file_permissions("doc1")
+        await _unwrap(drive_tools.get_drive_file_permissions)(
+            service=mock_service,
+            user_google_email="user@example.com",
+            file_id="doc1",
+        )
+
+    assert mock_execute.call_count == 2
@@ -0,0 +1,813 @@
+"""
+Unit tests for Gmail message helpers.
+"""
+
+import asyncio
+import base64
+import os
+import sys
+
+import pytest
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from gmail import gmail_tools
+from gmail.gmail_tools import _extract_message_bodies
+
+
+def _b64(text: str) -> str:
+    return base64.urlsafe_b64encode(text.encode("utf-8")).decode()
+
+
+def test_extract_message_bodies_from_nested_parts():
+    payload = {
+        "mimeType": "multipart/mixed",
+        "parts": [
+            {
+                "mimeType": "multipart/alternative",
+                "parts": [
+                    {"mimeType": "text/plain", "body": {"data": _b64("Héllo")}},
+                    {"mimeType": "text/html", "body": {"data": _b64("<p>Héllo</p>")}},
+                ],
+            },
+            {"mimeType": "application/pdf", "filename": "a.pdf", "body": {}},
+        ],
+    }
+
+    assert _extract_message_bodies(payload) == {
+        "text": "Héllo",
+        "html": "<p>Héllo</p>",
+    }
+
+
+def test_extract_message_bodies_single_part_payload():
+    payload = {"mimeType": "text/plain", "body": {"data": _b64("plain only")}}
+
+    assert _extract_message_bodies(payload) == {"text": "plain only", "html": ""}
+
+
+def test_extract_message_bodies_keeps_first_match_and_skips_other_parts():
+    payload = {
+        "mimeType": "multipart/mixed",
+        "parts": [
+            {"mimeType": "text/plain", "body": {"data": _b64("first")}},
+            {"mimeType": "text/html", "body": {"data": _b64("<b>first</b>")}},
+            {"mimeType": "text/plain", "body": {"data": _b64("second")}},
+            # Not valid base64; would be logged and skipped if it were decoded
+            {"mimeType": "image/png", "body": {"data": "!!!"}},
+        ],
+    }
+
+    assert _extract_message_bodies(payload) == {
+        "text": "first",
+        "html": "<b>first</b>",
+    }
+
+
+def test_extract_attachments_in_document_order():
+    from gmail.gmail_tools import _extract_attachments
+
+    def _attachment(name):
+        return {
+            "filename": name,
+            "mimeType": "application/pdf",
+            "body": {"attachmentId": f"id-{name}", "size": 10},
+        }
+
+    payload = {
+        "mimeType": "multipart/mixed",
+        "parts": [
+            {
+                "mimeType": "multipart/alternative",
+                "parts": [{"mimeType": "text/plain", "body": {"data": ""}}],
+            },
+            _attachment("a.pdf"),
+            {"mimeType": "multipart/mixed", "parts": [_attachment("b.pdf")]},
+            _attachment("c.pdf"),
+        ],
+    }
+
+    attachments = _extract_attachments(payload)
+
+    assert [a["filename"] for a in attachments] == ["a.pdf", "b.pdf", "c.pdf"]
+    assert attachments[0] == {
+        "filename": "a.pdf",
+        "mimeType": "application/pdf",
+        "size": 10,
+        "attachmentId": "id-a.pdf",
+    }
+
+
+def _unwrap(tool):
+    """Return the undecorated coroutine behind an MCP tool."""
+    fn = getattr(tool, "fn", tool)
+    while hasattr(fn, "__wrapped__"):
+        fn = fn.__wrapped__
+    return fn
+
+
+@pytest.mark.asyncio
+async def test_batch_fallback_fetches_with_bounded_concurrency():
+    """When the batch API fails, messages are fetched concurrently up to the cap."""
+    message_ids = [f"m{i}" for i in range(8)]
+    in_flight = 0
+    peak = 0
+
+    async def fake_to_thread(func, *args, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return func(*args, **kwargs)
+
+    service = Mock()
+    service.new_batch_http_request.side_effect = RuntimeError("batch unavailable")
+    service.users.return_value.messages.return_value.get.side_effect = (
+        lambda userId, id, **kwargs: Mock(
+            execute=Mock(return_value={"id": id, "payload": {"headers": []}})
+        )
+    )
+
+    with patch("gmail.gmail_tools.asyncio.to_thread", side_effect=fake_to_thread):
+        result = await _unwrap(gmail_tools.get_gmail_messages_content_batch)(
+            service=service,
+            message_ids=message_ids,
+            user_google_email="user@example.com",
+            format="metadata",
+        )
+
+    assert all(f"Message ID: {mid}" in result for mid in message_ids)
+    assert 1 < peak <= gmail_tools.GMAIL_MAX_CONCURRENT_REQUESTS
+
+
+@pytest.mark.asyncio
+async def test_get_message_content_uses_single_full_request():
+    service = Mock()
+    get_request = service.users.return_value.messages.return_value.get
+    get_request.return_value.execute.return_value = {
+        "payload": {
+            "mimeType": "text/plain",
+            "headers": [
+                {"name": "Subject", "value": "Hello"},
+                {"name": "From", "value": "a@example.com"},
+                {"name": "Message-ID", "value": "<abc@example.com>"},
+            ],
+            "body": {"data": _b64("Body text")},
+        }
+    }
+
+    result = await _unwrap(gmail_tools.get_gmail_message_content)(
+        service=service, message_id="m1", user_google_email="user@example.com"
+    )
+
+    get_request.assert_called_once_with(userId="me", id="m1", format="full")
+    assert "Subject: Hello" in result
+    assert "Message-ID: <abc@example.com>" in result
+    assert "Body text" in result
+
+
+def test_generate_gmail_web_url():
+    from gmail.gmail_tools import _generate_gmail_web_url
+
+    assert (
+        _generate_gmail_web_url("abc") == "https://mail.google.com/mail/u/0/#all/abc"
+    )
+    assert (
+        _generate_gmail_web_url("abc", account_index=2)
+        == "https://mail.google.com/mail/u/2/#all/abc"
+    )
+
+
+def test_format_gmail_results_plain_blocks():
+    from gmail.gmail_tools import _format_gmail_results_plain
+
+    result = _format_gmail_results_plain(
+        [{"id": "m1", "threadId": "t1"}, None, {"id": "", "threadId": None}], "q"
+    )
+
+    assert result.splitlines()[:13] == [
+        "Found 3 messages matching 'q':",
+        "",
+        "📧 MESSAGES:",
+        "  1. Message ID: m1",
+        "     Web Link: https://mail.google.com/mail/u/0/#all/m1",
+        "     Thread ID: t1",
+        "     Thread Link: https://mail.google.com/mail/u/0/#all/t1",
+        "",
+        "  2. Message: Invalid message data",
+        "     Error: Message object is null or malformed",
+        "",
+        "  3. Message ID: unknown",
+        "     Web Link: N/A",
+    ]
+
+
+@pytest.mark.parametrize(
+    "subject, body, body_format",
+    [
+        ("Hello", "Line one\r\nLine two\n", "plain"),
+        ("Report", "<p>Hi</p>", "html"),
+        ("Café", "ascii body", "plain"),
+        ("Hello", "naïve body", "plain"),
+        ("x" * 100, "long subject needs folding", "plain"),
+    ],
+)
+def test_prepare_gmail_message_matches_mimetext(subject, body, body_format):
+    """The generator-free fast path must produce exactly what MIMEText would."""
+    from email.mime.text import MIMEText
+    from gmail.gmail_tools import _prepare_gmail_message
+
+    raw_message, thread_id = _prepare_gmail_message(
+        subject=subject,
+        body=body,
+        to="to@example.com",
+        cc="cc@example.com",
+        body_format=body_format,
+        from_email="me@example.com",
+        from_name="Me Myself",
+        in_reply_to="<orig@example.com>",
+        references="<orig@example.com>",
+        thread_id="t1",
+    )
+
+    expected = MIMEText(body, body_format)
+    expected["Subject"] = f"Re: {subject}"
+    expected["From"] = "Me Myself <me@example.com>"
+    expected["To"] = "to@example.com"
+    expected["Cc"] = "cc@example.com"
+    expected["In-Reply-To"] = "<orig@example.com>"
+    expected["References"] = "<orig@example.com>"
+
+    assert base64.urlsafe_b64decode(raw_message) == expected.as_bytes()
+    assert thread_id == "t1"
+
+
+@pytest.mark.parametrize(
+    "header_names",
+    [gmail_tools.GMAIL_METADATA_HEADERS, ["subject", "FROM", "X-Custom"]],
+)
+def test_extract_headers_is_case_insensitive(header_names):
+    from gmail.gmail_tools import _extract_headers
+
+    payload = {
+        "headers": [
+            {"name": "SUBJECT", "value": "Hi"},
+            {"name": "from", "value": "a@example.com"},
+            {"name": "Received", "value": "ignored"},
+        ]
+    }
+
+    headers = _extract_headers(payload, header_names)
+
+    subject_key, from_key = header_names[0], header_names[1]
+    assert headers == {subject_key: "Hi", from_key: "a@example.com"}
+
+
+def test_format_batch_message_metadata_and_full():
+    from gmail.gmail_tools import _format_batch_message
+
+    headers = {"Subject": "Hi", "From": "a@example.com", "Cc": "c@example.com"}
+
+    assert _format_batch_message("m1", headers, None) == (
+        "Message ID: m1\nSubject: Hi\nFrom: a@example.com\n"
+        "Date: (unknown date)\nCc: c@example.com\n"
+        "Web Link: https://mail.google.com/mail/u/0/#all/m1\n"
+    )
+    assert _format_batch_message("m1", headers, "Body").endswith(
+        "#all/m1\n\nBody\n"
+    )
+
+
+@pytest.mark.parametrize(
+    "text_body, html_body, expected",
+    [
+        ("Plain text", "<p>Plain text</p>", "Plain text"),
+        ("   \n", "  <p>Only <b>HTML</b></p>\n", "Only HTML"),
+        ("<!-- fallback -->", "<p>Real</p>", "Real"),
+        ("", "", "[No readable content found]"),
+        (" \t", "\n", "[No readable content found]"),
+    ],
+)
+def test_format_body_content(text_body, html_body, expected):
+    from gmail.gmail_tools import _format_body_content
+
+    assert _format_body_content(text_body, html_body) == expected
+
+
+@pytest.mark.asyncio
+async def test_attachment_metadata_is_reused_within_ttl():
+    gmail_tools._attachment_metadata_cache.clear()
+    service = Mock()
+    get_message = service.users.return_value.messages.return_value.get
+    get_message.return_value.execute.return_value = {
+        "payload": {
+            "parts": [
+                {
+                    "filename": "a.pdf",
+                    "mimeType": "application/pdf",
+                    "body": {"attachmentId": "att1", "size": 10},
+                }
+            ]
+        }
+    }
+
+    first = await gmail_tools._get_message_attachments(service, "u@x.com", "m1")
+    second = await gmail_tools._get_message_attachments(service, "u@x.com", "m1")
+    await gmail_tools._get_message_attachments(service, "other@x.com", "m1")
+
+    assert first == second
+    assert first[0]["filename"] == "a.pdf"
+    assert get_message.return_value.execute.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_thread_batch_fallback_fetches_every_thread():
+    service = Mock()
+    service.new_batch_http_request.side_effect = RuntimeError("batch unavailable")
+    service.users.return_value.threads.return_value.get.side_effect = (
+        lambda userId, id, format: Mock(
+            execute=Mock(return_value={"id": id, "messages": []})
+        )
+    )
+
+    with patch(
+        "gmail.gmail_tools._iter_thread_lines",
+        side_effect=lambda thread, tid, include_bodies: iter([f"thread {tid}"]),
+    ):
+        result = await _unwrap(gmail_tools.get_gmail_threads_content_batch)(
+            service=service,
+            thread_ids=["t1", "t2", "t3"],
+            user_google_email="user@example.com",
+        )
+
+    assert "thread t1\n---\n\nthread t2\n---\n\nthread t3" in result
+
+
+@pytest.mark.asyncio
+async def test_thread_batch_runs_chunks_concurrently_on_separate_connections():
+    """Chunks overlap, each batch gets its own transport, and order is kept."""
+    thread_ids = [f"t{i}" for i in range(60)]
+    used_https = []
+    in_flight = 0
+    peak = 0
+
+    class FakeBatch:
+        def __init__(self, callback):
+            self._callback = callback
+            self._ids = []
+
+        def add(self, request, request_id):
+            self._ids.append(request_id)
+
+        def execute(self, http=None):
+            used_https.append(http)
+            for tid in self._ids:
+                self._callback(tid, {"id": tid}, None)
+
+    async def fake_to_thread(func, *args, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return func(*args, **kwargs)
+
+    service = Mock()
+    service.new_batch_http_request.side_effect = FakeBatch
+
+    with patch(
+        "gmail.gmail_tools.asyncio.to_thread", side_effect=fake_to_thread
+    ), patch(
+        "gmail.gmail_tools._iter_thread_lines",
+        side_effect=lambda thread, tid, include_bodies: iter([f"thread {tid}"]),
+    ):
+        result = await _unwrap(gmail_tools.get_gmail_threads_content_batch)(
+            service=service,
+            thread_ids=thread_ids,
+            user_google_email="user@example.com",
+        )
+
+    assert result.index("thread t0\n") < result.index("thread t25\n")
+    assert result.index("thread t25\n") < result.index("thread t59")
+    assert peak == 3
+    assert len({id(http) for http in used_https}) == 3
+    assert service._http not in used_https
+
+
+def test_format_thread_content_reads_headers_case_insensitively():
+    from gmail.gmail_tools import _format_thread_content
+
+    def _message(headers, body):
+        return {
+            "payload": {
+                "mimeType": "text/plain",
+                "headers": [{"name": k, "value": v} for k, v in headers],
+                "body": {"data": _b64(body)},
+            }
+        }
+
+    thread = {
+        "messages": [
+            _message(
+                [("Subject", "Plans"), ("From", "a@x.com"), ("Message-Id", "<1@x>")],
+                "First",
+            ),
+            _message(
+                [("subject", "Re: Plans"), ("from", "b@x.com"), ("Date", "Mon")],
+                "Second",
+            ),
+        ]
+    }
+
+    result = _format_thread_content(thread, "t1")
+
+    assert "Subject: Plans\nMessages: 2" in result
+    assert "=== Message 1 ===\nFrom: a@x.com\nDate: (unknown date)\nMessage-ID: <1@x>" in result
+    assert "=== Message 2 ===\nFrom: b@x.com\nDate: Mon\nSubject: Re: Plans" in result
+
+
+@pytest.mark.asyncio
+async def test_thread_batch_output_matches_per_thread_formatting():
+    threads = {
+        "t1": {
+            "messages": [
+                {
+                    "payload": {
+                        "mimeType": "text/plain",
+                        "headers": [{"name": "Subject", "value": "Hi"}],
+                        "body": {"data": _b64("Hello")},
+                    }
+                }
+            ]
+        },
+        "t3": {"messages": []},
+    }
+
+    class FakeBatch:
+        def __init__(self, callback):
+            self._callback = callback
+            self._ids = []
+
+        def add(self, request, request_id):
+            self._ids.append(request_id)
+
+        def execute(self, http=None):
+            for tid in self._ids:
+                self._callback(tid, threads.get(tid), None)
+
+    service = Mock()
+    service.new_batch_http_request.side_effect = FakeBatch
+
+    result = await _unwrap(gmail_tools.get_gmail_threads_content_batch)(
+        service=service,
+        thread_ids=["t1", "t2", "t3"],
+        user_google_email="user@example.com",
+    )
+
+    expected = "Retrieved 3 threads:\n\n" + "\n---\n\n".join(
+        [
+            gmail_tools._format_thread_content(threads["t1"], "t1"),
+            "⚠️ Thread t2: No data returned\n",
+            gmail_tools._format_thread_content(threads["t3"], "t3"),
+        ]
+    )
+    assert result == expected
+
+
+@pytest.mark.asyncio
+async def test_large_thread_batch_formats_off_the_event_loop():
+    import threading
+
+    thread_ids = [f"t{i}" for i in range(gmail_tools.GMAIL_THREAD_FORMAT_OFFLOAD_MIN)]
+    formatting_threads = set()
+
+    class FakeBatch:
+        def __init__(self, callback):
+            self._callback = callback
+            self._ids = []
+
+        def add(self, request, request_id):
+            self._ids.append(request_id)
+
+        def execute(self, http=None):
+            for tid in self._ids:
+                self._callback(tid, {"id": tid}, None)
+
+    def fake_lines(thread, tid, include_bodies):
+        formatting_threads.add(threading.get_ident())
+        yield f"thread {tid}"
+
+    service = Mock()
+    service.new_batch_http_request.side_effect = FakeBatch
+
+    with patch("gmail.gmail_tools._iter_thread_lines", side_effect=fake_lines):
+        result = await _unwrap(gmail_tools.get_gmail_threads_content_batch)(
+            service=service,
+            thread_ids=thread_ids,
+            user_google_email="user@example.com",
+        )
+
+    assert result.endswith("thread t6\n---\n\nthread t7")
+    assert formatting_threads and threading.get_ident() not in formatting_threads
+
+
+@pytest.mark.asyncio
+async def test_delete_label_builds_labels_resource_once():
+    service = Mock()
+    labels = service.users.return_value.labels
+    labels.return_value.get.return_value.execute.return_value = {"name": "Old"}
+
+    result = await _unwrap(gmail_tools.manage_gmail_label)(
+        service=service,
+        user_google_email="user@example.com",
+        action="delete",
+        label_id="L1",
+    )
+
+    assert result == "Label 'Old' (ID: L1) deleted successfully!"
+    assert labels.call_count == 1
+    labels.return_value.delete.assert_called_once_with(userId="me", id="L1")
+
+
+@pytest.mark.asyncio
+async def test_thread_metadata_format_requests_headers_and_skips_bodies():
+    service = Mock()
+    get_thread = service.users.return_value.threads.return_value.get
+    get_thread.return_value.execute.return_value = {
+        "messages": [
+            {
+                "payload": {
+                    "headers": [
+                        {"name": "Subject", "value": "Plans"},
+                        {"name": "From", "value": "a@x.com"},
+                    ]
+                }
+            }
+        ]
+    }
+
+    with patch("gmail.gmail_tools._extract_message_bodies") as extract_bodies:
+        result = await _unwrap(gmail_tools.get_gmail_thread_content)(
+            service=service,
+            thread_id="t1",
+            user_google_email="user@example.com",
+            format="metadata",
+        )
+
+    get_thread.assert_called_once_with(
+        id="t1",
+        userId="me",
+        format="metadata",
+        metadataHeaders=gmail_tools._THREAD_MESSAGE_HEADERS,
+    )
+    extract_bodies.assert_not_called()
+    assert result == (
+        "Thread ID: t1\nSubject: Plans\nMessages: 1\n\n"
+        "=== Message 1 ===\nFrom: a@x.com\nDate: (unknown date)\n"
+    )
+
+
+def _http_error(status, headers=None):
+    import httplib2
+    from googleapiclient.errors import HttpError
+
+    return HttpError(httplib2.Response({"status": status, **(headers or {})}), b"")
+
+
+@pytest.mark.parametrize(
+    "error, expected",
+    [
+        (_http_error(429, {"retry-after": "3"}), 3),
+        (_http_error(503, {"retry-after": "600"}), gmail_tools.GMAIL_MAX_RETRY_DELAY),
+        (_http_error(404), None),
+        (ValueError("bad"), None),
+        (None, None),
+    ],
+)
+def test_retry_delay(error, expected):
+    assert gmail_tools._retry_delay(error, 0) == expected
+
+
+def test_retry_delay_backs_off_exponentially():
+    import ssl
+
+    assert 4 <= gmail_tools._retry_delay(ssl.SSLError(), 2) < 5
+    assert 2 <= gmail_tools._retry_delay(_http_error(500), 1) < 3
+
+
+@pytest.mark.asyncio
+async def test_thread_batch_refetches_rate_limited_threads():
+    class FakeBatch:
+        def __init__(self, callback):
+            self._callback = callback
+            self._ids = []
+
+        def add(self, request, request_id):
+            self._ids.append(request_id)
+
+        def execute(self, http=None):
+            self._callback("t1", {"id": "t1"}, None)
+            self._callback("t2", None, _http_error(429))
+            self._callback("t3", None, _http_error(404))
+
+    single_fetch = Mock(
+        side_effect=[_http_error(503), {"id": "t2", "refetched": True}]
+    )
+    service = Mock()
+    service.new_batch_http_request.side_effect = FakeBatch
+    service.users.return_value.threads.return_value.get.side_effect = (
+        lambda **kwargs: Mock(execute=single_fetch)
+    )
+
+    with patch("gmail.gmail_tools.asyncio.sleep") as sleep, patch(
+        "gmail.gmail_tools._iter_thread_lines",
+        side_effect=lambda thread, tid, include_bodies: iter([f"thread {thread}"]),
+    ):
+        result = await _unwrap(gmail_tools.get_gmail_threads_content_batch)(
+            service=service,
+            thread_ids=["t1", "t2", "t3"],
+            user_google_email="user@example.com",
+        )
+
+    assert single_fetch.call_count == 2
+    sleep.assert_called_once()
+    assert "thread {'id': 't2', 'refetched': True}" in result
+    assert "⚠️ Thread t3:" in result
+
+
+@pytest.mark.asyncio
+async def test_list_gmail_filters_renders_criteria_and_actions():
+    service = Mock()
+    filters = service.users.return_value.settings.return_value.filters
+    filters.return_value.list.return_value.execute.return_value = {
+        "filter": [
+            {
+                "id": "f1",
+                "criteria": {
+                    "excludeChats": True,
+                    "from": "a@x.com",
+                    "size": 100,
+                    "sizeComparison": "larger",
+                    "hasAttachment": False,
+                },
+                "action": {"addLabelIds": ["L1", "L2"], "forward": "b@x.com"},
+            },
+            {"id": "f2"},
+        ]
+    }
+
+    result = await _unwrap(gmail_tools.list_gmail_filters)(
+        service=service, user_google_email="user@example.com"
+    )
+
+    assert result == (
+        "Found 2 filters:\n\n"
+        "🔹 Filter ID: f1\n  Criteria:\n"
+        "    • From: a@x.com\n    • Exclude chats\n    • Size larger 100 bytes\n"
+        "  Actions:\n    • Forward to: b@x.com\n    • Add labels: L1, L2\n\n"
+        "🔹 Filter ID: f2\n  Criteria:\n    • (none)\n  Actions:\n    • (none)"
+    )
+
+
+def test_extract_message_bodies_skips_text_attachments():
+    payload = {
+        "mimeType": "multipart/mixed",
+        "parts": [
+            {
+                "mimeType": "multipart/alternative",
+                "parts": [
+                    {"mimeType": "text/plain", "body": {"data": _b64("Body")}},
+                ],
+            },
+            {
+                "mimeType": "text/plain",
+                "filename": "notes.txt",
+                "body": {"data": _b64("Attachment")},
+            },
+        ],
+    }
+
+    assert _extract_message_bodies(payload) == {"text": "Body", "html": ""}
+
+
+@pytest.mark.asyncio
+async def test_list_gmail_labels_groups_system_and_user_labels():
+    service = Mock()
+    service.users.return_value.labels.return_value.list.return_value.execute.return_value = {
+        "labels": [
+            {"id": "Label_1", "name": "Work", "type": "user"},
+            {"id": "INBOX", "name": "INBOX", "type": "system"},
+            {"id": "Label_2", "name": "Home"},
+        ]
+    }
+
+    result = await _unwrap(gmail_tools.list_gmail_labels)(
+        service=service, user_google_email="user@example.com"
+    )
+
+    assert result == (
+        "Found 3 labels:\n\n"
+        "📂 SYSTEM LABELS:\n  • INBOX (ID: INBOX)\n\n"
+        "🏷️  USER LABELS:\n  • Work (ID: Label_1)\n  • Home (ID: Label_2)"
+    )
+
+
+@pytest.mark.parametrize(
+    "name, expected_body",
+    [
+        (
+            "Renamed",
+            {
+                "labelListVisibility": "labelShow",
+                "messageListVisibility": "show",
+                "name": "Renamed",
+            },
+        ),
+        (None, {"labelListVisibility": "labelShow", "messageListVisibility": "show"}),
+    ],
+)
+@pytest.mark.asyncio
+async def test_update_label_patches_without_fetching(name, expected_body):
+    service = Mock()
+    labels = service.users.return_value.labels.return_value
+    labels.patch.return_value.execute.return_value = {"name": "Renamed", "id": "L1"}
+
+    result = await _unwrap(gmail_tools.manage_gmail_label)(
+        service=service,
+        user_google_email="user@example.com",
+        action="update",
+        label_id="L1",
+        name=name,
+    )
+
+    assert result == "Label updated successfully!\nName: Renamed\nID: L1"
+    labels.get.assert_not_called()
+    labels.patch.assert_called_once_with(userId="me", id="L1", body=expected_body)
+
+
+async def _modify_labels(service, message_id, add=None, remove=None, user="u@x.com"):
+    return await _unwrap(gmail_tools.modify_gmail_message_labels)(
+        service=service,
+        user_google_email=user,
+        message_id=message_id,
+        add_label_ids=add,
+        remove_label_ids=remove,
+    )
+
+
+@pytest.mark.asyncio
+async def test_single_label_modify_uses_modify():
+    service = Mock()
+    messages = service.users.return_value.messages.return_value
+
+    result = await _modify_labels(service, "m1", remove=["INBOX"])
+
+    assert result.startswith("Message labels updated successfully!\nMessage ID: m1")
+    messages.modify.assert_called_once_with(
+        userId="me", id="m1", body={"removeLabelIds": ["INBOX"]}
+    )
+    messages.batchModify.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_label_modifies_are_coalesced():
+    services = [Mock() for _ in range(4)]
+
+    await asyncio.gather(
+        _modify_labels(services[0], "m1", remove=["INBOX"]),
+        _modify_labels(services[1], "m2", remove=["INBOX"]),
+        _modify_labels(services[2], "m3", remove=["INBOX"]),
+        _modify_labels(services[3], "m4", add=["STARRED"]),
+    )
+
+    batch_modify = services[0].users.return_value.messages.return_value.batchModify
+    batch_modify.assert_called_once_with(
+        userId="me", body={"removeLabelIds": ["INBOX"], "ids": ["m1", "m2", "m3"]}
+    )
+    for service in services[:3]:
+        service.users.return_value.messages.return_value.modify.assert_not_called()
+    services[3].users.return_value.messages.return_value.modify.assert_called_once_with(
+        userId="me", id="m4", body={"addLabelIds": ["STARRED"]}
+    )
+
+
+@pytest.mark.asyncio
+async def test_failed_coalesced_modify_falls_back_per_message():
+    services = [Mock(), Mock()]
+    messages = [s.users.return_value.messages.return_value for s in services]
+    messages[0].batchModify.return_value.execute.side_effect = RuntimeError("bad id")
+    messages[1].modify.return_value.execute.side_effect = RuntimeError("not found")
+
+    results = await asyncio.gather(
+        _modify_labels(services[0], "m1", add=["STARRED"]),
+        _modify_labels(services[1], "missing", add=["STARRED"]),
+        return_exceptions=True,
+    )
+
+    assert results[0].startswith("Message labels updated successfully!")
+    assert isinstance(results[1], Exception)
+    messages[0].modify.assert_called_once_with(
+        userId="me", id="m1", body={"addLabelIds": ["STARRED"]}
+    )
@@ -0,0 +1,82 @@
+"""
+Unit tests for Google API service construction.
+"""
+
+import sys
+import os
+
+from unittest.mock import ANY, patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from google.oauth2.credentials import Credentials
+
+from auth import discovery
+from auth.discovery import build_service, release_service
+from auth.json_model import API_JSON_MODEL
+
+
+def test_build_service_uses_bundled_document_and_shared_model():
+    credentials = Credentials(token="token")
+
+    with patch("auth.discovery.build") as mock_build:
+        service = build_service("gmail", "v1", credentials)
+
+    mock_build.assert_not_called()
+    assert service._model is API_JSON_MODEL
+    assert service._baseUrl == "https://gmail.googleapis.com/"
+
+
+def test_build_service_parses_a_fresh_document_per_call():
+    """googleapiclient mutates the document, so services must not share one."""
+    credentials = Credentials(token="token")
+
+    first = build_service("drive", "v3", credentials)
+    second = build_service("drive", "v3", credentials)
+
+    assert first._rootDesc is not second._rootDesc
+
+
+def test_build_service_falls_back_to_build_without_bundled_document():
+    credentials = Credentials(token="token")
+
+    with patch("auth.discovery._static_discovery_doc", return_value=None), patch(
+        "auth.discovery.build"
+    ) as mock_build:
+        build_service("unknownapi", "v1", credentials)
+
+    mock_build.assert_called_once_with(
+        "unknownapi", "v1", http=ANY, model=API_JSON_MODEL
+    )
+    assert mock_build.call_args.kwargs["http"].credentials is credentials
+
+
+def test_released_transport_is_reused_by_the_next_service():
+    discovery._idle_transports.clear()
+    first = build_service("gmail", "v1", Credentials(token="first"))
+    transport = first._http.http
+
+    release_service(first)
+    second = build_service("gmail", "v1", Credentials(token="second"))
+
+    assert second._http.http is transport
+    assert second._http.credentials.token == "second"
+    assert not discovery._idle_transports
+
+
+def test_release_service_closes_when_pool_is_full():
+    discovery._idle_transports.clear()
+    services = [
+        build_service("gmail", "v1", Credentials(token="token"))
+        for _ in range(discovery.MAX_IDLE_TRANSPORTS + 1)
+    ]
+    extra = services[-1]
+
+    for service in services[:-1]:
+        release_service(service)
+    with patch.object(extra, "close") as close:
+        release_service(extra)
+
+    close.assert_called_once()
+    assert len(discovery._idle_transports) == discovery.MAX_IDLE_TRANSPORTS
+    discovery._idle_transports.clear()
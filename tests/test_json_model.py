@@ -0,0 +1,39 @@
+"""
+Unit tests for the Google API client JSON model.
+"""
+
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from auth import json_model
+from auth.json_model import FastJsonModel
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def model(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(json_model, "orjson", None)
+    return FastJsonModel(data_wrapper=False)
+
+
+def test_deserialize_bytes(model):
+    assert model.deserialize(b'{"files": [{"id": "a"}]}') == {"files": [{"id": "a"}]}
+
+
+def test_deserialize_text(model):
+    assert model.deserialize('{"name": "café"}') == {"name": "café"}
+
+
+def test_deserialize_invalid_returns_text(model):
+    assert model.deserialize(b"Not Found") == "Not Found"
+
+
+def test_deserialize_unwraps_data():
+    model = FastJsonModel(data_wrapper=True)
+    assert model.deserialize(b'{"data": {"id": "a"}}') == {"id": "a"}